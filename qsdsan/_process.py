@@ -14,12 +14,15 @@ for license details.
 '''
 
 from warnings import warn
+from functools import lru_cache
 from . import Component, Components
 from .utils import load_data, get_stoichiometric_coeff
 from thermosteam.utils import chemicals_user, read_only
 from thermosteam import settings
-from sympy import symbols, Matrix, simplify, lambdify
+from sympy import symbols, sympify, Matrix, simplify, lambdify, cse, numbered_symbols
 from sympy.parsing.sympy_parser import parse_expr
+from sympy.printing.pycode import pycode
+import math
 import numpy as np
 import pandas as pd
 
@@ -27,12 +30,116 @@ __all__ = ('DynamicParameter', 'Kinetics', 'MultiKinetics',
            'Process', 'Processes', 'CompiledProcesses', )
 
 _load_components = settings.get_default_chemicals
+_precisions = {'f64': np.float64, 'f32': np.float32}
 
 class UndefinedProcess(AttributeError):
     '''AttributeError regarding undefined Component objects.'''
     def __init__(self, ID):
         super().__init__(repr(ID))
 
+# Rate equations are passed in with all parameter values substituted, so
+# processes with the same parameter values share the generated functions,
+# and the functions are only regenerated when any parameter value changes.
+@lru_cache(maxsize=32)
+def _lambdify_rate_equations(IDs, rate_eqs):
+    return lambdify(list(symbols(IDs)), rate_eqs, 'numpy')
+
+def _rate_eq_lines(IDs, rate_eqs, state, rho):
+    # common subexpressions (e.g., Monod terms shared by several processes)
+    # are evaluated only once
+    subexprs, rate_eqs = cse(rate_eqs, symbols=numbered_symbols('_x'))
+    lines = [f'    {ID} = {state}[{i}]' for i, ID in enumerate(IDs)]
+    lines += [f'    {x} = {pycode(expr)}' for x, expr in subexprs]
+    lines += [f'    {rho.format(i)} = {pycode(eq)}' for i, eq in enumerate(rate_eqs)]
+    return lines
+
+# The symbolic stoichiometry is shared by all clones of a compiled process set,
+# so it is only lambdified once and then evaluated for each set of parameter
+# values, instead of substituting the values into each coefficient
+@lru_cache(maxsize=32)
+def _lambdify_stoichiometry(stoichio):
+    free = set()
+    for row in stoichio:
+        for v in row:
+            free.update(getattr(v, 'free_symbols', ()))
+    free = sorted(free, key=str)
+    return tuple(str(i) for i in free), lambdify(free, Matrix(stoichio), 'numpy')
+
+def _stoichio_product_lines(stoichio_T, rho, out):
+    lines = []
+    for j, row in enumerate(stoichio_T):
+        terms = [f'{c!r}*{rho.format(i)}' for i, c in enumerate(row) if c]
+        lines.append(f'    {out}[{j}] = {" + ".join(terms) or "0."}')
+    return lines
+
+def _exec_lines(lines):
+    namespace = {'math': math}
+    exec('\n'.join(lines), namespace)
+    return namespace['f']
+
+def _load_numba():
+    try: import numba
+    except ModuleNotFoundError:
+        raise ModuleNotFoundError('`numba` is required for jit-compiled processes, '
+                                  'install it by running `pip install numba`.')
+    return numba
+
+@lru_cache(maxsize=32)
+def _jit_rate_function(IDs, rate_eqs):
+    '''
+    Generate a function that evaluates the rate equations given an array of
+    state variables and writes the results into an array of rates,
+    compiled with `numba.njit`.
+    '''
+    numba = _load_numba()
+    lines = ['def f(state_arr, rho_arr):']
+    lines += _rate_eq_lines(IDs, rate_eqs, 'state_arr', 'rho_arr[{}]')
+    return numba.njit(error_model='numpy')(_exec_lines(lines))
+
+@lru_cache(maxsize=32)
+def _jit_rate_batch_function(IDs, rate_eqs):
+    '''
+    Generate a function that evaluates the rate equations for a 2D array of
+    state variables (one sample per row), with the samples evaluated in
+    parallel threads, compiled with `numba.njit`.
+    '''
+    numba = _load_numba()
+    prange = numba.prange
+    f = _jit_rate_function(IDs, rate_eqs)
+    @numba.njit(parallel=True)
+    def f_batch(state_arrs, rhos):
+        for i in prange(state_arrs.shape[0]):
+            f(state_arrs[i], rhos[i])
+    return f_batch
+
+@lru_cache(maxsize=32)
+def _jit_stoichio_product(stoichio_T):
+    '''
+    Generate a function that multiplies the (transposed) stoichiometric
+    coefficients with an array of rates and writes the results into an array
+    of production rates, with the products unrolled and the zero coefficients
+    skipped, compiled with `numba.njit`.
+    '''
+    numba = _load_numba()
+    lines = ['def f(rho_arr, out):']
+    lines += _stoichio_product_lines(stoichio_T, 'rho_arr[{}]', 'out')
+    return numba.njit(_exec_lines(lines))
+
+@lru_cache(maxsize=32)
+def _lsoda_rhs(IDs, rate_eqs, stoichio_T):
+    '''
+    Generate the right-hand side of dC/dt = production rates as a
+    `numba.cfunc` with the signature required by `numbalsoda.lsoda`.
+    '''
+    numba = _load_numba()
+    # same as `numbalsoda.lsoda_sig`, so `numbalsoda` is only needed for solving
+    double, ptr = numba.types.double, numba.types.CPointer(numba.types.double)
+    sig = numba.types.void(double, ptr, ptr, ptr)
+    lines = ['def f(t, y, dy, p):']
+    lines += _rate_eq_lines(IDs, rate_eqs, 'y', '_r{}')
+    lines += _stoichio_product_lines(stoichio_T, '_r{}', 'dy')
+    return numba.cfunc(sig, error_model='numpy')(_exec_lines(lines))
+
 #%%
 class DynamicParameter:
     """
@@ -1121,12 +1228,14 @@ class CompiledProcesses(Processes):
         if all_numeric: M_stch = np.asarray(M_stch)
         dct['_stoichiometry'] = M_stch
         dct['_stoichio_lambdified'] = None
+        dct['_stoichio_T'] = None
         dct['_rate_equations'] = rate_eqs
         if all(rate_eqs):
             dct['_production_rates'] = list(Matrix(M_stch).T * Matrix(rate_eqs))
         else:
             dct['_production_rates'] = None
         dct['_rate_function'] = None
+        dct['_rate_lambdified'] = False
 
     @property
     def parameters(self):
@@ -1141,8 +1250,11 @@ class CompiledProcesses(Processes):
     def set_parameters(self, **parameters):
         '''Set values to stoichiometric and/or kinetic parameters.'''
         self._parameters.update(parameters)
+        dct = self.__dict__
         if self._stoichio_lambdified is not None:
-            self.__dict__['_stoichio_lambdified'] = None
+            dct['_stoichio_lambdified'] = dct['_stoichio_T'] = None
+        if dct.get('_rate_lambdified'):
+            dct['_rate_function'] = None
 
     def dynamic_parameter(self, function=None, symbol=None, params={}):
         '''Add a function for the evaluation of a dynamic parameter in the
@@ -1160,7 +1272,7 @@ class CompiledProcesses(Processes):
     def params_eval(self, state_arr):
         '''Evaluate the dynamic parameters in the stoichiometry given an array of state variables.'''
         dct = self._parameters
-        for k, p in self._dyn_params:
+        for k, p in self._dyn_params.items():
             dct[k] = p(state_arr)
 
     @property
@@ -1184,20 +1296,36 @@ class CompiledProcesses(Processes):
         if dct:
             sbs = [i.symbol for i in dct.values()]
             lamb = lambdify(sbs, self.stoichiometry.to_numpy(), 'numpy')
-            arr = np.empty((self.size, len(self._components)))
+            arr = np.empty((self.size, len(self._components)), dtype=self._dtype)
             def f():
                 v = [v for k,v in dct_vals.items() if k in dct.keys()]
                 arr[:,:] = lamb(*v)
                 return arr
             self.__dict__['_stoichio_lambdified'] = f
+            self.__dict__['_stoichio_T'] = self.__dict__['_stoichio_product'] = None
         else:
-            try:
-                stoichio_arr = self.stoichiometry.to_numpy(dtype=float)
-            except TypeError:
-                isa = isinstance
-                undefined = [k for k, v in dct_vals if not isa(v, (float, int))]
-                raise TypeError(f'Undefined static parameters: {undefined}')
+            stoichio_arr = None
+            stoichio = self._stoichiometry
+            isa = isinstance
+            if isa(stoichio, list):
+                names, f = _lambdify_stoichiometry(tuple(map(tuple, stoichio)))
+                args = [dct_vals.get(n) for n in names]
+                if all(isa(v, (float, int)) for v in args):
+                    stoichio_arr = np.asarray(f(*args), dtype=self._dtype)
+            if stoichio_arr is None:
+                try:
+                    stoichio_arr = self.stoichiometry.to_numpy(dtype=self._dtype)
+                except TypeError:
+                    undefined = [k for k, v in dct_vals.items() if not isa(v, (float, int))]
+                    raise TypeError(f'Undefined static parameters: {undefined}')
             self.__dict__['_stoichio_lambdified'] = lambda : stoichio_arr
+            # static stoichiometry, keep a C-contiguous transpose for the
+            # matrix-vector product in `production_rates_eval`
+            M_T = self.__dict__['_stoichio_T'] = np.ascontiguousarray(stoichio_arr.T)
+            if self.__dict__.get('_jit'):
+                coeffs = tuple(tuple(float(c) for c in row) for row in M_T)
+                self.__dict__['_stoichio_product'] = _jit_stoichio_product(coeffs)
+            else: self.__dict__['_stoichio_product'] = None
 
     def stoichio_eval(self):
         '''Return the stoichiometric coefficients.'''
@@ -1220,6 +1348,8 @@ class CompiledProcesses(Processes):
 
     def set_rate_function(self, k):
         dct = self.__dict__
+        dct['_rate_lambdified'] = False
+        dct['_rate_batch'] = None
         if k is None:
             dct['_rate_function'] = None
         elif isinstance(k, MultiKinetics):
@@ -1232,8 +1362,96 @@ class CompiledProcesses(Processes):
                             f'(i.e., an array of state variables), or None, '
                             f'not {type(k)}')
 
+    def set_jit(self, jit=True):
+        '''
+        Whether to compile the rate equations with `numba.njit`, only effective
+        when none of the processes has a user-defined kinetic function.
+        The compiled function is regenerated when parameter values are changed.
+        The product of a static stoichiometry and the rates is compiled as well.
+        '''
+        if jit: _load_numba()
+        dct = self.__dict__
+        dct['_jit'] = bool(jit)
+        dct['_stoichio_lambdified'] = dct['_stoichio_T'] = None
+        if dct.get('_rate_lambdified'):
+            dct['_rate_function'] = None
+
+    @property
+    def _dtype(self):
+        return self.__dict__.get('_dtype', np.float64)
+
+    def set_precision(self, precision='f64'):
+        '''
+        Set the floating-point precision of the evaluated stoichiometry,
+        either "f64" or "f32". State variables and kinetic rates are always
+        evaluated in double precision.
+        '''
+        try: dtype = _precisions[precision]
+        except KeyError:
+            raise ValueError(f'precision must be one of {tuple(_precisions)}, '
+                             f'not {precision!r}')
+        dct = self.__dict__
+        dct['_dtype'] = dtype
+        dct['_stoichio_lambdified'] = dct['_stoichio_T'] = None
+
+    def _fold_rate_equations(self):
+        # `xreplace` is much faster than `subs` for replacing symbols by values
+        values = {symbols(k): sympify(v) for k, v in self._parameters.items()
+                  if v is not None}
+        return tuple(eq.xreplace(values) for eq in self._rate_equations)
+
     def _collect_rate_func(self):
-        self.__dict__['_rate_function'] = MultiKinetics(self)
+        dct = self.__dict__
+        rate_eqs = self._rate_equations
+        # lambdify all rate equations into one function when none of
+        # the processes has a user-defined kinetic function
+        if all(rate_eqs) and all(i._rate_function is None for i in self.tuple):
+            IDs = tuple(self._components.IDs)
+            eqs = self._fold_rate_equations()
+            rho_arr = np.empty(self.size)
+            if dct.get('_jit'):
+                f_jit = _jit_rate_function(IDs, eqs)
+                def f(state_arr, params={}):
+                    f_jit(state_arr, rho_arr)
+                    return rho_arr
+                # the parallel kernel is only compiled upon the first batch evaluation
+                def f_batch(state_arrs):
+                    rhos = np.empty((state_arrs.shape[0], self.size))
+                    _jit_rate_batch_function(IDs, eqs)(np.ascontiguousarray(state_arrs), rhos)
+                    return rhos
+            else:
+                lamb = _lambdify_rate_equations(IDs, eqs)
+                def f(state_arr, params={}):
+                    rho_arr[:] = lamb(*state_arr)
+                    return rho_arr
+                def f_batch(state_arrs):
+                    rhos = np.empty((state_arrs.shape[0], self.size))
+                    for i, rho in enumerate(lamb(*state_arrs.T)):
+                        rhos[:,i] = rho
+                    return rhos
+            dct['_rate_function'] = MultiKinetics(self, function=f)
+            dct['_rate_batch'] = f_batch
+            dct['_rate_lambdified'] = True
+        else:
+            dct['_rate_function'] = MultiKinetics(self)
+            dct['_rate_batch'] = None
+            dct['_rate_lambdified'] = False
+
+    def rate_eval_batch(self, state_arrs):
+        '''
+        Return the kinetic rates of the processes given a 2D array of
+        state variables, one sample per row, e.g., for an ensemble of
+        reactors or a Monte Carlo sweep.
+        The rate equations are evaluated vectorized across the samples
+        when none of the processes has a user-defined kinetic function,
+        or in parallel threads if the rate equations are jit-compiled.
+        '''
+        state_arrs = np.asarray(state_arrs, dtype=float)
+        f = self.rate_function
+        f_batch = self.__dict__.get('_rate_batch')
+        if f_batch is None:
+            return np.array([f(state_arr).copy() for state_arr in state_arrs])
+        return f_batch(state_arrs)
 
     # def rate_eval(self, state_arr):
     #     '''Return the kinetic rates given an array of state variables.'''
@@ -1250,10 +1468,81 @@ class CompiledProcesses(Processes):
 
     def production_rates_eval(self, state_arr):
         '''Return the rates of production or consumption of the components.'''
-        self.params_eval(state_arr)
-        M_stoichio = self.stoichio_eval()
+        if self._dyn_params: self.params_eval(state_arr)
+        if self._stoichio_lambdified is None: self._lambdify_stoichio()
         rho_arr = self.rate_function(state_arr)
-        return np.dot(M_stoichio.T, rho_arr)
+        f = self._stoichio_product
+        if f is not None:
+            out = np.empty(len(self._components))
+            f(rho_arr, out)
+            return out
+        M_T = self._stoichio_T
+        if M_T is None: M_T = self._stoichio_lambdified().T
+        return np.dot(M_T, rho_arr)
+
+    def production_rates_eval_batch(self, state_arrs):
+        '''
+        Return the rates of production or consumption of the components
+        given a 2D array of state variables, one sample per row.
+        '''
+        state_arrs = np.asarray(state_arrs, dtype=float)
+        rhos = self.rate_eval_batch(state_arrs)
+        if self._stoichio_lambdified is None: self._lambdify_stoichio()
+        M_T = self._stoichio_T
+        if M_T is not None: return rhos @ M_T.T
+        out = np.empty((rhos.shape[0], len(self._components)))
+        for i, (state_arr, rho_arr) in enumerate(zip(state_arrs, rhos)):
+            if self._dyn_params: self.params_eval(state_arr)
+            out[i] = self._stoichio_lambdified().T @ rho_arr
+        return out
+
+    def solve_lsoda(self, y0, t_eval, rtol=1e-6, atol=1e-8, mxstep=10000):
+        '''
+        Integrate the concentrations of a batch system, i.e., dC/dt equals the
+        production rates, using `numbalsoda.lsoda` with the rate equations and
+        the stoichiometry compiled into one `numba.cfunc`.
+        Only available when all rate equations are symbolic and the
+        stoichiometry is static, requires `numbalsoda` to be installed.
+
+        Parameters
+        ----------
+        y0 : Iterable(float)
+            Initial concentrations of the components.
+        t_eval : Iterable(float)
+            Time points at which the concentrations are returned.
+        rtol : float, optional
+            Relative tolerance. The default is 1e-6.
+        atol : float, optional
+            Absolute tolerance. The default is 1e-8.
+        mxstep : int, optional
+            Maximum number of steps. The default is 10000.
+
+        Returns
+        -------
+        usol : numpy.ndarray
+            Concentrations at each of the time points, one row per time point.
+        success : bool
+            Whether the integration was successful.
+        '''
+        try: from numbalsoda import lsoda
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError('`numbalsoda` is required for `solve_lsoda`, '
+                                      'install it by running `pip install numbalsoda`.')
+        rhs = self._lsoda_function()
+        y0 = np.asarray(y0, dtype=float)
+        t_eval = np.asarray(t_eval, dtype=float)
+        return lsoda(rhs.address, y0, t_eval, rtol=rtol, atol=atol, mxstep=mxstep)
+
+    def _lsoda_function(self):
+        # right-hand side for `solve_lsoda` with the current parameter values
+        if not all(self._rate_equations):
+            raise RuntimeError('not all processes have symbolic rate equations.')
+        if self._stoichio_lambdified is None: self._lambdify_stoichio()
+        M_T = self._stoichio_T
+        if M_T is None:
+            raise RuntimeError('dynamic stoichiometric parameters are not supported.')
+        coeffs = tuple(tuple(float(c) for c in row) for row in M_T)
+        return _lsoda_rhs(tuple(self._components.IDs), self._fold_rate_equations(), coeffs)
 
     def subgroup(self, IDs):
         '''Create a new subgroup of :class:`CompiledProcesses` objects.'''
@@ -1296,5 +1585,39 @@ class CompiledProcesses(Processes):
         copy.compile()
         return copy
 
+    def _clone(self):
+        '''
+        Return a copy that shares the parsed stoichiometry and rate equations
+        with the original one, but has its own :class:`Process` objects,
+        parameter values and generated functions, without recompiling.
+        '''
+        new = object.__new__(self.__class__)
+        dct = new.__dict__
+        dct.update(self.__dict__)
+        params = dct['_parameters'] = self._parameters.copy()
+        dyn_params = dct['_dyn_params'] = self._dyn_params.copy()
+        # sympy expressions are immutable, only the containers need to be copied
+        stoichio = self._stoichiometry
+        dct['_stoichiometry'] = stoichio.copy() if isinstance(stoichio, np.ndarray) \
+            else [list(row) for row in stoichio]
+        if self._production_rates is not None:
+            dct['_production_rates'] = list(self._production_rates)
+        processes = []
+        for i in self.tuple:
+            pc = object.__new__(i.__class__)
+            pc.__dict__.update(i.__dict__)
+            if isinstance(pc._stoichiometry, np.ndarray):
+                pc._stoichiometry = pc._stoichiometry.copy()
+            pc._parameters = params
+            pc._dyn_params = dyn_params
+            pc._rate_function = None
+            dct[pc.ID] = pc
+            processes.append(pc)
+        dct['tuple'] = tuple(processes)
+        dct['_stoichio_lambdified'] = dct['_stoichio_T'] = dct['_stoichio_product'] = None
+        dct['_rate_function'] = dct['_rate_batch'] = None
+        dct['_rate_lambdified'] = False
+        return new
+
     def __repr__(self):
         return f"{type(self).__name__}([{', '.join(self.IDs)}])"
\ No newline at end of file
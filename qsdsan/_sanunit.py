@@ -267,11 +267,14 @@ class SanUnit(Unit, isabstract=True):
 
     def _get_stream_info(self, info, ins_or_outs, _stream_info,
                          T, P, flow, composition, N, IDs):
-        info += 'ins...\n' if ins_or_outs=='ins' else 'outs...\n'
+        # `info` is a list of strings, joined once in `_info`
+        is_ins = ins_or_outs == 'ins'
+        info.append('ins...\n' if is_ins else 'outs...\n')
+        from_or_to = 'from' if is_ins else 'to'
         i = 0
         for stream in getattr(self, ins_or_outs):
             if not stream:
-                info += f'[{i}] {stream}\n'
+                info.append(f'[{i}] {stream}\n')
                 i += 1
                 continue
             ws_info = stream._wastestream_info() if isinstance(stream, WasteStream) else ''
@@ -280,29 +283,26 @@ class SanUnit(Unit, isabstract=True):
                     # '\n' # this breaks the code block in sphinx
                 stream_info += ('\n' + ws_info) if ws_info else ''
             else:
-                stream_info = stream._wastestream_info()
-            su = stream._source if ins_or_outs=='ins' else stream._sink
+                stream_info = ws_info
+            su = stream._source if is_ins else stream._sink
             index = stream_info.index('\n')
-            from_or_to = 'from' if ins_or_outs=='ins' else 'to'
             link_info = f'  {from_or_to}  {type(su).__name__}-{su}\n' if su else '\n'
-            info += f'[{i}] {stream.ID}' + link_info + stream_info[index+1:]
+            info.append(f'[{i}] {stream.ID}' + link_info + stream_info[index+1:])
             i += 1
         return info
 
 
     def _info(self, T, P, flow, composition, N, IDs, _stream_info):
         '''Information of the unit.'''
-        if self.ID:
-            info = f'{type(self).__name__}: {self.ID}\n'
-        else:
-            info = f'{type(self).__name__}\n'
+        name = type(self).__name__
+        info = [f'{name}: {self.ID}\n' if self.ID else f'{name}\n']
 
-        info = self._get_stream_info(info, 'ins', _stream_info,
-                                     T, P, flow, composition, N, IDs)
+        self._get_stream_info(info, 'ins', _stream_info,
+                              T, P, flow, composition, N, IDs)
 
-        info = self._get_stream_info(info, 'outs', _stream_info,
-                                     T, P, flow, composition, N, IDs)
-        info = info.replace('\n ', '\n    ')
+        self._get_stream_info(info, 'outs', _stream_info,
+                              T, P, flow, composition, N, IDs)
+        info = ''.join(info).replace('\n ', '\n    ')
         return info[:-1]
 
 
@@ -77,6 +77,31 @@ vol_unit = auom('L/hr')
 conc_unit = auom('mg/L')
 
 
+class _SubgroupView:
+    '''
+    Compiled component data of select components, indexed from the arrays
+    of the full set so that no new :class:`CompiledComponents` is compiled,
+    only the arrays in `_attrs` are available.
+    '''
+    __slots__ = ('_components', '_index')
+
+    _attrs = frozenset((
+        'i_C', 'i_N', 'i_P', 'i_K', 'i_Mg', 'i_Ca', 'i_mass', 'i_charge',
+        'i_COD', 'i_NOD', 'f_BOD5_COD', 'f_uBOD_COD', 'f_Vmass_Totmass',
+        's', 'c', 'x', 'b', 'rb', 'org',
+        ))
+
+    def __init__(self, components, IDs):
+        self._components = components
+        self._index = components.indices(IDs)
+
+    def __getattr__(self, attr):
+        if attr not in self._attrs:
+            raise AttributeError(f'{attr!r} is not available for a subgroup of components, '
+                                 f'only {sorted(self._attrs)} are.')
+        return getattr(self._components, attr)[self._index]
+
+
 # %%
 
 # =============================================================================
@@ -612,7 +637,7 @@ class WasteStream(SanStream):
         else:
             IDs = tuple(subgroup_IDs)
 
-        cmps = all_cmps.subgroup(IDs)
+        cmps = _SubgroupView(all_cmps, IDs)
         cmp_c = self.iconc[IDs] # [mg/L]
         exclude_gas = cmps.s + cmps.c + cmps.x
 
@@ -8,20 +8,26 @@ Please refer to https://github.com/QSD-Group/QSDsan/blob/main/LICENSE.txt
 for license details.
 '''
 
+from threading import Lock
+from types import MappingProxyType
 from thermosteam.utils import chemicals_user
 from thermosteam import settings
 from qsdsan import Components, Processes, _pk
 from ..utils import ospath, data_path, save_pickle, load_pickle
+from . import _get_default_cmps, _load_processes
 
 __all__ = ('load_CANDO_cmps', 'CANDO')
 
 _path = ospath.join(data_path, 'process_data/_CANDO.tsv')
 _path_cmps = ospath.join(data_path, '_CANDO_cmps.pckl')
 _load_components = settings.get_default_chemicals
+_cmps_cache = {}
+_cmps_lock = Lock()
+_conserved_for = ('COD', 'charge', 'N')
 
 ############# Components with default notation #############
 def _create_CANDO_cmps(pickle=False):
-    cmps = Components.load_default()
+    cmps = _get_default_cmps()
 
     S_NO3 = cmps.S_NO3.copy('S_NO3')
     S_NO3.description = 'Nitrate'
@@ -37,9 +43,6 @@ def _create_CANDO_cmps(pickle=False):
    
     S_N2 = cmps.S_N2.copy('S_N2')
     S_N2.description = 'Nitrogen'
-    
-    S_S = cmps.S_F.copy('S_S')
-    S_S.description = 'Readily Degradable Substrate'
 
     S_F = cmps.S_F.copy('S_F')
     S_F.description = 'Readily Degradable Substrate'
@@ -77,65 +80,29 @@ def _create_CANDO_cmps(pickle=False):
 
 
 def load_CANDO_cmps():
-    if _pk:
-        return load_pickle(_path_cmps)
-    else:
-        return _create_CANDO_cmps(pickle=False)
-
-
-
-############ Processes in ASM1 #################
-# params = ('Y_H', 'Y_A', 'f_P',
-#           'mu_H', 'K_S', 'K_O_H', 'K_NO', 'b_H',
-#           'mu_A', 'K_NH', 'K_O_A', 'b_A',
-#           'eta_g', 'k_a', 'k_h', 'K_X', 'eta_h')
-
-# asm1 = Processes.load_from_file(data_path,
-#                                 conserved_for=('COD', 'charge', 'N'),
-#                                 parameters=params,
-#                                 compile=True)
-
-# ASM1 typical values at 20 degree C
-# asm1.set_parameters(
-#     Y_A = 0.24,                  # autotrophic yield = 0.24 gCOD/gN
-#     Y_H = 0.67,                  # heterotrophic yield = 0.67 gCOD/gCOD
-#     f_P = 0.08,                  # fraction of biomass yielding particulate products = 0.08, unitless
-#     mu_H = 6,                    # heterotrophic maximum specific growth rate = 6.0 d^(-1)
-#     K_S = 20,                    # readily biodegradable substrate half saturation coefficient = 20.0 gCOD/m3
-#     K_O_H = 0.2,                 # O2 half saturation coefficient = 0.2 gO2/m3
-#     K_NO = 0.5,                  # nitrate half saturation coefficient = 0.5 gN/m3
-#     b_H = 0.62,                  # heterotrophic biomass decay rate constant = 0.62 d^(-1)
-#     eta_g = 0.8,                 # reduction factor for anoxic growth of heterotrophs = 0.8, unitless
-#     eta_h = 0.4,                 # anoxic hydrolysis reduction factor = 0.4, unitless
-#     k_h = 3.0,                   # hydrolysis rate constant = 3.0 d^(-1)
-#     K_X = 0.03,                  # slowly biodegradable substrate half saturation coefficient for hydrolysis = 0.03 gCOD/gCOD
-#     mu_A = 0.8,                  # autotrophic maximum specific growth rate = 0.8 d^(-1)
-#     K_NH = 1.0,                  # ammonium (nutrient) half saturation coefficient = 1.0 gN/m3
-#     K_O_A = 0.4,                 # O2 half saturation coefficient for autotrophic growth = 0.4 gO2/m3
-#     b_A = 0.05,                  # !!! BSM1 value
-#     k_a = 0.08                   # ammonification rate constant = 0.08 d^(-1)/(gCOD/m3)
-#     )
-
-# ASM1 typical values at 10 degree C
-# asm1.set_parameters(
-#     Y_A = 0.24,                  # autotrophic yield = 0.24 gCOD/gN
-#     Y_H = 0.67,                  # heterotrophic yield = 0.67 gCOD/gCOD
-#     f_P = 0.08,                  # fraction of biomass yielding particulate products = 0.08, unitless
-#     mu_H = 3,                    # heterotrophic maximum specific growth rate = 3.0 d^(-1)
-#     K_S = 20,                    # readily biodegradable substrate half saturation coefficient = 20.0 gCOD/m3
-#     K_O_H = 0.2,                 # O2 half saturation coefficient = 0.2 gO2/m3
-#     K_NO = 0.5,                  # nitrate half saturation coefficient = 0.5 gN/m3
-#     b_H = 0.20,                  # heterotrophic biomass decay rate constant = 0.20 d^(-1)
-#     eta_g = 0.8,                 # reduction factor for anoxic growth of heterotrophs = 0.8, unitless
-#     eta_h = 0.4,                 # anoxic hydrolysis reduction factor = 0.4, unitless
-#     k_h = 1.0,                   # hydrolysis rate constant = 1.0 d^(-1)
-#     K_X = 0.01,                  # slowly biodegradable substrate half saturation coefficient for hydrolysis = 0.01 gCOD/gCOD
-#     mu_A = 0.3,                  # autotrophic maximum specific growth rate = 0.3 d^(-1)
-#     K_NH = 1.0,                  # ammonium (nutrient) half saturation coefficient = 1.0 gN/m3
-#     K_O_A = 0.4,                 # O2 half saturation coefficient for autotrophic growth = 0.4 gO2/m3
-#     b_A = 0.05,                  # !!! BSM1 value
-#     k_a = 0.04                   # ammonification rate constant = 0.04 d^(-1)/(gCOD/m3)
-#     )
+    '''Load the CANDO components, the pickle file is only read once per session.'''
+    with _cmps_lock:
+        cmps = _cmps_cache.get('CANDO')
+        if cmps is None:
+            if _pk: cmps = load_pickle(_path_cmps)
+            else: cmps = _create_CANDO_cmps(pickle=False)
+            _cmps_cache['CANDO'] = cmps
+    return cmps
+
+
+
+# Default values of the kinetic and stoichiometric parameters of `CANDO.__new__`,
+# `test_process_defaults` checks that both are the same
+_CANDO_DEFAULTS = MappingProxyType({'Y_PO4':0.3, 'Y_PHA':0.2, 'Y_DPAO_NOx':0.5,
+                                    'i_P_BM':0.02, 'i_P_XI':0.01, 'f_1':.2,
+                                    'q_PHA':.53, 'K_S_DPAO':10, 'K_PP_DPAO':.05,
+                                    'q_PP':.0375, 'K_PO4_PP':0.2, 'K_PHA':0.1,
+                                    'K_max_DPAO':0.2, 'K_iPP_DPAO':.05,
+                                    'K_DPAO_PO4':0.05, 'mu_DPAO1':0.07,
+                                    'mu_DPAO2':0.019, 'mu_DPAO3':.142,
+                                    'mu_DPAO4':.142, 'K_NO3':.251, 'K_NO2':.81,
+                                    'K_NO':.0021, 'K_N2O':.0052, 'b_DPAO':.005,
+                                    'b_PP':.005, 'b_PHA':.005, 'K_NOx':.5})
 
 @chemicals_user
 class CANDO(Processes):
@@ -191,6 +158,11 @@ class CANDO(Processes):
         The default is 0.4.
     k_a : float, optional
         Ammonification rate constant, in [m^3/g COD/d]. The default is 0.05.
+    jit : bool, optional
+        Whether to compile the rate equations with `numba.njit`. The default is False.
+    precision : str, optional
+        Floating-point precision of the evaluated stoichiometry, either "f64"
+        or "f32". The default is "f64".
     path : str, optional
         Alternative file path for the Gujer matrix. The default is None.
     References
@@ -212,6 +184,8 @@ class CANDO(Processes):
 
 
 
+    _DEFAULTS = _CANDO_DEFAULTS
+
     def __new__(cls, components=None, Y_PO4=0.3, Y_PHA=0.2, Y_DPAO_NOx=0.5,
                 i_P_BM=0.02,
                 i_P_XI=0.01,f_1=.2,q_PHA=.53,K_S_DPAO=10,K_PP_DPAO=.05,q_PP=.0375,
@@ -220,30 +194,26 @@ class CANDO(Processes):
                 mu_DPAO4=.142,
                 K_NO3=.251,K_NO2=.81,K_NO=.0021,K_N2O=.0052,b_DPAO=.005,
                 b_PP=.005,b_PHA=.005,K_NOx=.5,
-                fr_SS_COD=0.75, path=None, **kwargs):
-        if not path: path = _path
+                fr_SS_COD=0.75, jit=False, precision='f64', path=None,
+                **kwargs):
+        # parameter values are collected before any other local is defined
+        locals_ = locals()
+        params = {k: locals_[k] for k in cls._DEFAULTS}
+        # absolute path so that the cached processes are keyed by file, not by cwd
+        path = ospath.abspath(path) if path else _path
         
 
        
         cmps = _load_components(components)
-        cmps.X_I.i_mass  = fr_SS_COD
-        cmps.refresh_constants()
+        if cmps.X_I.i_mass != fr_SS_COD:
+            cmps.X_I.i_mass = fr_SS_COD
+            cmps.refresh_constants()
         
-        self = Processes.load_from_file(path,
-                                        conserved_for=('COD', 'charge', 'N'),
-                                        parameters=cls._params,
-                                        components=cmps,
-                                        compile=True)
-
-        self.set_parameters(Y_PO4=Y_PO4,Y_PHA=Y_PHA,Y_DPAO_NOx=Y_DPAO_NOx,
-                            i_P_BM=i_P_BM,i_P_XI=i_P_XI,f_1=f_1,q_PHA=q_PHA,
-                            K_S_DPAO=K_S_DPAO,K_PP_DPAO=K_PP_DPAO,q_PP=q_PP,
-                            K_PO4_PP=K_PO4_PP,K_PHA=K_PHA,K_max_DPAO=K_max_DPAO,
-                            K_iPP_DPAO=K_iPP_DPAO,K_DPAO_PO4=K_DPAO_PO4,mu_DPAO1=mu_DPAO1,
-                            mu_DPAO2=mu_DPAO2,mu_DPAO3=mu_DPAO3,mu_DPAO4=mu_DPAO4,
-                            K_NO3=K_NO3,K_NO2=K_NO2,K_NO=K_NO,K_N2O=K_N2O,
-                            b_DPAO=b_DPAO,b_PP=b_PP,b_PHA=b_PHA,K_NOx=K_NOx,
-                            **kwargs)
+        self = _load_processes(path, cmps, _conserved_for, cls._params)
+        if jit: self.set_jit()
+        self.set_precision(precision)
+
+        self.set_parameters(**params, **kwargs)
         return self
 
                             
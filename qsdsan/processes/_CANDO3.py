@@ -8,20 +8,27 @@ Please refer to https://github.com/QSD-Group/QSDsan/blob/main/LICENSE.txt
 for license details.
 '''
 
+from threading import Lock
+from types import MappingProxyType
 from thermosteam.utils import chemicals_user
 from thermosteam import settings
 from qsdsan import Component, Components, Processes, _pk, Process   # added `Component` and `Process` to the import
 from qsdsan.utils import ospath, data_path, save_pickle, load_pickle
+from . import _get_default_cmps, _load_processes
 
 __all__ = ('load_CANDO3_cmps', 'CANDO3')
 
 _path = ospath.join(data_path, 'process_data/_CANDO3.tsv')
 _path_cmps = ospath.join(data_path, '_CANDO3_cmps.pckl')
 _load_components = settings.get_default_chemicals
+_cmps_cache = {}
+_cmps_lock = Lock()
+# materials conserved in any of the processes, for the cache key
+_conserved_for = ('COD', 'N', 'P', 'NOD', 'charge')
 
 ############# Components with default notation #############
 def _create_CANDO3_cmps(pickle=False):
-    cmps = Components.load_default()
+    cmps = _get_default_cmps()
 
     # S_NO3 = cmps.S_NO3.copy('S_NO3')
     # S_NO3.description = 'Nitrate'
@@ -83,13 +90,16 @@ def _create_CANDO3_cmps(pickle=False):
     X_S.description = 'Slowly Biodegradable Substrate'
 
 
+    # the default set is shared, so the components that are used as they are
+    # are still copied to keep changes to the CANDO3 components from leaking,
     # add water for the creation of WasteStream objects
-    # Basically, if you don't need to make any modification to the component (i.e.,
-    # it is exactly the component you need), you can skip the copying part.
-    cmps_CANDO3 = Components([cmps.S_NO3, cmps.S_NO2, cmps.S_NH4, cmps.S_O2, 
-                              S_NO, S_N2O, cmps.S_N2, cmps.S_F, cmps.S_PO4, 
-                              cmps.S_Ac, S_ALK, X_PHA, X_PP, X_I, X_H, 
-                              cmps.X_PAO, X_S, cmps.H2O])
+    S_NO3, S_NO2, S_NH4, S_O2, S_N2, S_F, S_PO4, S_Ac, X_PAO = (
+        getattr(cmps, ID).copy(ID) for ID in
+        ('S_NO3', 'S_NO2', 'S_NH4', 'S_O2', 'S_N2', 'S_F', 'S_PO4', 'S_Ac', 'X_PAO'))
+    cmps_CANDO3 = Components([S_NO3, S_NO2, S_NH4, S_O2, 
+                              S_NO, S_N2O, S_N2, S_F, S_PO4, 
+                              S_Ac, S_ALK, X_PHA, X_PP, X_I, X_H, 
+                              X_PAO, X_S, cmps.H2O])
     cmps_CANDO3.compile()
 
     if pickle:
@@ -104,65 +114,73 @@ def _create_CANDO3_cmps(pickle=False):
 
 
 def load_CANDO3_cmps():
-    if _pk:
-        return load_pickle(_path_cmps)
-    else:
-        return _create_CANDO3_cmps(pickle=False)
-
-
-
-############ Processes in ASM1 #################
-# params = ('Y_H', 'Y_A', 'f_P',
-#           'mu_H', 'K_S', 'K_O_H', 'K_NO', 'b_H',
-#           'mu_A', 'K_NH', 'K_O_A', 'b_A',
-#           'eta_g', 'k_a', 'k_h', 'K_X', 'eta_h')
-
-# asm1 = Processes.load_from_file(data_path,
-#                                 conserved_for=('COD', 'charge', 'N'),
-#                                 parameters=params,
-#                                 compile=True)
-
-# ASM1 typical values at 20 degree C
-# asm1.set_parameters(
-#     Y_A = 0.24,                  # autotrophic yield = 0.24 gCOD/gN
-#     Y_H = 0.67,                  # heterotrophic yield = 0.67 gCOD/gCOD
-#     f_P = 0.08,                  # fraction of biomass yielding particulate products = 0.08, unitless
-#     mu_H = 6,                    # heterotrophic maximum specific growth rate = 6.0 d^(-1)
-#     K_S = 20,                    # readily biodegradable substrate half saturation coefficient = 20.0 gCOD/m3
-#     K_O_H = 0.2,                 # O2 half saturation coefficient = 0.2 gO2/m3
-#     K_NO = 0.5,                  # nitrate half saturation coefficient = 0.5 gN/m3
-#     b_H = 0.62,                  # heterotrophic biomass decay rate constant = 0.62 d^(-1)
-#     eta_g = 0.8,                 # reduction factor for anoxic growth of heterotrophs = 0.8, unitless
-#     eta_h = 0.4,                 # anoxic hydrolysis reduction factor = 0.4, unitless
-#     k_h = 3.0,                   # hydrolysis rate constant = 3.0 d^(-1)
-#     K_X = 0.03,                  # slowly biodegradable substrate half saturation coefficient for hydrolysis = 0.03 gCOD/gCOD
-#     mu_A = 0.8,                  # autotrophic maximum specific growth rate = 0.8 d^(-1)
-#     K_NH = 1.0,                  # ammonium (nutrient) half saturation coefficient = 1.0 gN/m3
-#     K_O_A = 0.4,                 # O2 half saturation coefficient for autotrophic growth = 0.4 gO2/m3
-#     b_A = 0.05,                  # !!! BSM1 value
-#     k_a = 0.08                   # ammonification rate constant = 0.08 d^(-1)/(gCOD/m3)
-#     )
-
-# ASM1 typical values at 10 degree C
-# asm1.set_parameters(
-#     Y_A = 0.24,                  # autotrophic yield = 0.24 gCOD/gN
-#     Y_H = 0.67,                  # heterotrophic yield = 0.67 gCOD/gCOD
-#     f_P = 0.08,                  # fraction of biomass yielding particulate products = 0.08, unitless
-#     mu_H = 3,                    # heterotrophic maximum specific growth rate = 3.0 d^(-1)
-#     K_S = 20,                    # readily biodegradable substrate half saturation coefficient = 20.0 gCOD/m3
-#     K_O_H = 0.2,                 # O2 half saturation coefficient = 0.2 gO2/m3
-#     K_NO = 0.5,                  # nitrate half saturation coefficient = 0.5 gN/m3
-#     b_H = 0.20,                  # heterotrophic biomass decay rate constant = 0.20 d^(-1)
-#     eta_g = 0.8,                 # reduction factor for anoxic growth of heterotrophs = 0.8, unitless
-#     eta_h = 0.4,                 # anoxic hydrolysis reduction factor = 0.4, unitless
-#     k_h = 1.0,                   # hydrolysis rate constant = 1.0 d^(-1)
-#     K_X = 0.01,                  # slowly biodegradable substrate half saturation coefficient for hydrolysis = 0.01 gCOD/gCOD
-#     mu_A = 0.3,                  # autotrophic maximum specific growth rate = 0.3 d^(-1)
-#     K_NH = 1.0,                  # ammonium (nutrient) half saturation coefficient = 1.0 gN/m3
-#     K_O_A = 0.4,                 # O2 half saturation coefficient for autotrophic growth = 0.4 gO2/m3
-#     b_A = 0.05,                  # !!! BSM1 value
-#     k_a = 0.04                   # ammonification rate constant = 0.04 d^(-1)/(gCOD/m3)
-#     )
+    '''Load the CANDO3 components, the pickle file is only read once per session.'''
+    with _cmps_lock:
+        cmps = _cmps_cache.get('CANDO3')
+        if cmps is None:
+            if _pk: cmps = load_pickle(_path_cmps)
+            else: cmps = _create_CANDO3_cmps(pickle=False)
+            _cmps_cache['CANDO3'] = cmps
+    return cmps
+
+
+
+def _create_processes(path, cmps, parameters):
+    # Added 'P' to conserved_for
+    pcs = Processes.load_from_file(path,
+                                   conserved_for=( 'charge', 'P'),
+                                   parameters=parameters,
+                                   components=cmps,
+                                   compile=False)
+
+    if path == _path:
+        _p12 = Process('anox_storage_PP',
+                       'S_PO4 + [Y_PHA]X_PHA + [?]S_NO3 -> X_PP + [?]S_N2 + [?]S_NH4 + [?]S_ALK',
+                       components=cmps,
+                       ref_component='X_PP',
+                       rate_equation='q_PP * S_O2/(k_O2+S_O2) * S_PO4/(k_PS+S_PO4) * S_ALK/(k_ALK+S_ALK) * (X_PHA/X_PAO)/(k_PHA+X_PHA/X_PAO) * (k_MAX-X_PP/X_PAO)/(k_IPP+k_MAX-X_PP/X_PAO) * X_PAO * n_NO3 * k_O2/S_O2 * S_NO3/(k_NO3+S_NO3)',
+                       parameters=('Y_PHA', 'q_PP', 'k_O2', 'k_PS', 'k_ALK', 'k_PHA', 'n_NO3', 'k_IPP', 'k_NO3'),
+                       conserved_for=('COD', 'N', 'P', 'NOD', 'charge'))
+
+        _p14 = Process('PAO_anox_growth',
+                       '[1/Y_PAO]X_PHA + [?]S_NO3 + [?]S_PO4 -> X_PAO + [?]S_N2 + [?]S_NH4  + [?]S_ALK',
+                       components=cmps,
+                       ref_component='X_PAO',
+                       rate_equation='mu_PAO * S_O2/(k_O2 + S_O2) * S_NH4/(k_NH4 + S_NH4) * S_PO4/(k_P + S_PO4) * S_ALK/(k_ALK + S_ALK) * (X_PHA/X_PAO)/(k_PHA + X_PHA/X_PAO) * X_PAO * n_NO3 * k_O2/S_O2 * S_NO3/(k_NO3 + S_NO3)',
+                       parameters=('Y_PAO', 'mu_PAO', 'k_O2', 'k_NH4', 'k_P', 'k_ALK', 'k_PHA', 'n_NO3', 'k_NO3'),
+                       conserved_for=('COD', 'N', 'P', 'NOD', 'charge'))
+        pcs.extend([_p12, _p14])
+
+    return pcs
+
+
+_CANDO3_DEFAULTS = MappingProxyType({'Y_H':.4, 'Y_storage':.55, 'Y_H_sto':.67,
+                                     'mu1_hb_ss':4.536, 'mu2_hb_ss':.864,
+                                     'mu3_hb_ss':3.408, 'mu4_hb_ss':1.032,
+                                     'b_H':.624, 'k_S1':5, 'k_S2':20,
+                                     'k_S3':2.4, 'k_S4':20, 'k_NO3':.251,
+                                     'k_NO2':.81, 'k_NO':.0021, 'k_N2O':.0052,
+                                     'k_I1_NO2':12, 'k_I2_NO2':10,
+                                     'k_I3_NO2':17, 'k_I4_NO2':8,
+                                     'mu_storage':.72, 'b_storage':.096,
+                                     'mu1_hb_xpha':.792, 'mu2_hb_xpha':.576,
+                                     'mu3_hb_xpha':3.048, 'mu4_hb_xpha':.552,
+                                     'k_sto':1, 'mu_H':5.15, 'nu_H1':.236,
+                                     'nu_H2':.153, 'nu_H3':.423, 'nu_H4':.16,
+                                     'k_OH1':.1, 'k_OH2':.1, 'k_OH3':.1,
+                                     'k_OH4':.1, 'k_OH5':.1, 'k_HB_NO3':.2,
+                                     'k_HB_NO2':.2, 'k_HB_NO':.05,
+                                     'k_HB_N2O':.05, 'k_HB_I1_NO':.5,
+                                     'k_HB_I2_NO':.3, 'k_HB_I3_NO':.075,
+                                     'Y_PHA':.625, 'Y_PAO':.2, 'Y_PO4':.3,
+                                     'f_XI':.1, 'f_1':.1, 'i_NBM':.07,
+                                     'i_NXS':.02, 'i_PBM':.07, 'i_NXI':.02,
+                                     'b_PAO':.2, 'b_PP':.2, 'b_PHA':.2,
+                                     'k_PP':.01, 'q_PHA':3.0, 'k_A':4.0,
+                                     'k_ALK':0.1, 'q_PP':1.5, 'k_PS':0.2,
+                                     'k_MAX':0.34, 'k_P':.01, 'k_IPP':0.02,
+                                     'k_O2':0.2, 'k_PHA':0.01, 'n_NO3':.6,
+                                     'mu_PAO':1, 'k_NH4':.05})
 
 @chemicals_user
 class CANDO3(Processes):
@@ -218,6 +236,11 @@ class CANDO3(Processes):
         The default is 0.4.
     k_a : float, optional
         Ammonification rate constant, in [m^3/g COD/d]. The default is 0.05.
+    jit : bool, optional
+        Whether to compile the rate equations with `numba.njit`. The default is False.
+    precision : str, optional
+        Floating-point precision of the evaluated stoichiometry, either "f64"
+        or "f32". The default is "f64".
     path : str, optional
         Alternative file path for the Gujer matrix. The default is None.
     References
@@ -244,6 +267,8 @@ class CANDO3(Processes):
                'b_PAO','b_PP','b_PHA','k_PP','q_PHA','k_A','k_ALK','q_PP','k_PS',
                'k_MAX','k_P','k_IPP','k_O2','k_NO3','k_PHA','n_NO3','mu_PAO','k_NH4')
 
+    _DEFAULTS = _CANDO3_DEFAULTS
+
     def __new__(cls, components=None,Y_H=.4,Y_storage=.55,Y_H_sto=.67,mu1_hb_ss=4.536,
                 mu2_hb_ss=.864,mu3_hb_ss=3.408,mu4_hb_ss=1.032,b_H=.624,k_S1=5,k_S2=20,k_S3=2.4,k_S4=20,
                 k_NO3=.251,k_NO2=.81,k_NO=.0021,k_N2O=.0052,k_I1_NO2=12,k_I2_NO2=10,k_I3_NO2=17,k_I4_NO2=8,
@@ -260,55 +285,23 @@ class CANDO3(Processes):
                 b_PAO =.2,b_PP=.2,b_PHA=.2,k_PP=.01, 
                 q_PHA=3.0,k_A=4.0,k_ALK=0.1,q_PP=1.5,k_PS=0.2,k_MAX=0.34,k_P=.01,
                 k_IPP=0.02,k_O2=0.2, k_PHA=0.01,n_NO3=.6,mu_PAO=1,k_NH4=.05,
-                fr_SS_COD=0.75, path=None, **kwargs):
-        if not path: path = _path
+                fr_SS_COD=0.75, jit=False, precision='f64', path=None,
+                **kwargs):
+        # parameter values are collected before any other local is defined
+        locals_ = locals()
+        params = {k: locals_[k] for k in cls._DEFAULTS}
+        # absolute path so that the cached processes are keyed by file, not by cwd
+        path = ospath.abspath(path) if path else _path
         
         cmps = _load_components(components)
-        cmps.X_I.i_mass  = fr_SS_COD
-
-        cmps.refresh_constants()
+        if cmps.X_I.i_mass != fr_SS_COD:
+            cmps.X_I.i_mass = fr_SS_COD
+            cmps.refresh_constants()
         
-        # Added 'P' to conserved_for
-        self = Processes.load_from_file(path,
-                                        conserved_for=( 'charge', 'P'),
-                                        parameters=cls._params,
-                                        components=cmps,
-                                        compile=False)
-        
-        if path == _path:
-            _p12 = Process('anox_storage_PP',
-                           'S_PO4 + [Y_PHA]X_PHA + [?]S_NO3 -> X_PP + [?]S_N2 + [?]S_NH4 + [?]S_ALK',
-                           components=cmps,
-                           ref_component='X_PP',
-                           rate_equation='q_PP * S_O2/(k_O2+S_O2) * S_PO4/(k_PS+S_PO4) * S_ALK/(k_ALK+S_ALK) * (X_PHA/X_PAO)/(k_PHA+X_PHA/X_PAO) * (k_MAX-X_PP/X_PAO)/(k_IPP+k_MAX-X_PP/X_PAO) * X_PAO * n_NO3 * k_O2/S_O2 * S_NO3/(k_NO3+S_NO3)',
-                           parameters=('Y_PHA', 'q_PP', 'k_O2', 'k_PS', 'k_ALK', 'k_PHA', 'n_NO3', 'k_IPP', 'k_NO3'),
-                           conserved_for=('COD', 'N', 'P', 'NOD', 'charge'))
-
-            _p14 = Process('PAO_anox_growth',
-                           '[1/Y_PAO]X_PHA + [?]S_NO3 + [?]S_PO4 -> X_PAO + [?]S_N2 + [?]S_NH4  + [?]S_ALK',
-                           components=cmps,
-                           ref_component='X_PAO',
-                           rate_equation='mu_PAO * S_O2/(k_O2 + S_O2) * S_NH4/(k_NH4 + S_NH4) * S_PO4/(k_P + S_PO4) * S_ALK/(k_ALK + S_ALK) * (X_PHA/X_PAO)/(k_PHA + X_PHA/X_PAO) * X_PAO * n_NO3 * k_O2/S_O2 * S_NO3/(k_NO3 + S_NO3)',
-                           parameters=('Y_PAO', 'mu_PAO', 'k_O2', 'k_NH4', 'k_P', 'k_ALK', 'k_PHA', 'n_NO3', 'k_NO3'),
-                           conserved_for=('COD', 'N', 'P', 'NOD', 'charge'))
-            self.extend([_p12, _p14])
-
-        self.compile()
-
-        self.set_parameters(Y_storage=Y_storage,Y_H_sto=Y_H_sto,mu1_hb_ss=mu1_hb_ss,mu2_hb_ss=mu2_hb_ss,
-                            mu3_hb_ss=mu3_hb_ss,mu4_hb_ss=mu4_hb_ss,b_H=b_H,k_NO2=k_NO2, k_NO=k_NO,k_N2O=k_N2O,
-                            k_I1_NO2=k_I1_NO2,k_I2_NO2=k_I2_NO2,k_I3_NO2=k_I3_NO2,k_I4_NO2=k_I4_NO2,
-                            mu_storage=mu_storage,b_storage=b_storage,mu1_hb_xpha=mu1_hb_xpha,mu2_hb_xpha=mu2_hb_xpha,
-                            mu3_hb_xpha=mu3_hb_xpha,mu4_hb_xpha=mu4_hb_xpha,k_sto=k_sto,
-            mu_H=mu_H,nu_H1=nu_H1,nu_H2=nu_H2,
-                            nu_H3=nu_H3,nu_H4=nu_H4,k_OH1=k_OH1,k_OH2=k_OH2,k_OH3=k_OH3,
-                            k_OH4=k_OH4,k_OH5=k_OH5,k_S1=k_S1,k_S2=k_S2,k_S3=k_S3,k_S4=k_S4,
-                            k_HB_NO3=k_HB_NO3,k_HB_NO2=k_HB_NO2,k_HB_NO=k_HB_NO,
-                            k_HB_N2O=k_HB_N2O,k_HB_I1_NO=k_HB_I1_NO,k_HB_I2_NO=k_HB_I2_NO,
-                            k_HB_I3_NO=k_HB_I3_NO,Y_PHA=Y_PHA,Y_PAO=Y_PAO,Y_PO4=Y_PO4,f_XI=f_XI,
-                            Y_H=Y_H,b_PAO=b_PAO,b_PP=b_PP,b_PHA=b_PHA,k_PP=k_PP,q_PHA=q_PHA,
-                            k_A=k_A,k_ALK=k_ALK,q_PP=q_PP,k_PS=k_PS,k_MAX=k_MAX,k_P=k_P,
-                            k_IPP=k_IPP,k_O2=k_O2,k_NO3=k_NO3,k_PHA=k_PHA,n_NO3=n_NO3,
-                            mu_PAO=mu_PAO,k_NH4=k_NH4,f_1=f_1,i_NBM=i_NBM,i_NXS=i_NXS,i_PBM=i_PBM,i_NXI=i_NXI,
-                            **kwargs)
+        self = _load_processes(path, cmps, _conserved_for, cls._params,
+                               create=_create_processes)
+        if jit: self.set_jit()
+        self.set_precision(precision)
+
+        self.set_parameters(**params, **kwargs)
         return self
\ No newline at end of file
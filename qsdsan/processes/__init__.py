@@ -12,27 +12,79 @@ Please refer to https://github.com/QSD-Group/QSDsan/blob/main/LICENSE.txt
 for license details.
 '''
 
-from ._aeration import *
-from ._asm1 import *
-from ._asm2d import *
-from ._CANDO import *
-from ._CANDO3 import *
-from ._Sharon import *
-
-from . import (
-    _aeration,
-    _asm1,
-    _asm2d,
-    _CANDO,
-    _CANDO3,
-    _Sharon
-    )
-
-__all__ = (
-    *_aeration.__all__,
-    *_asm1.__all__,
-    *_asm2d.__all__,
-    *_CANDO.__all__,
-    *_CANDO3.__all__,
-    *_Sharon.__all__,
-           )
+from functools import lru_cache
+from .. import Components, Processes
+from ..utils.parsing import _ic_values
+
+# Process models are only imported when first accessed (PEP 562),
+# so that `import qsdsan` does not load all of them
+_LAZY = {
+    'DiffusedAeration': '_aeration',
+    'create_asm1_cmps': '_asm1',
+    'ASM1': '_asm1',
+    'create_asm2d_cmps': '_asm2d',
+    'ASM2d': '_asm2d',
+    'load_CANDO_cmps': '_CANDO',
+    'CANDO': '_CANDO',
+    'load_CANDO3_cmps': '_CANDO3',
+    'CANDO3': '_CANDO3',
+    'load_Sharon_cmps': '_Sharon',
+    'Sharon': '_Sharon',
+    }
+
+__all__ = tuple(_LAZY)
+
+
+# The default components are only loaded once and shared by the creators
+# of the components of the process models, components taken from this set
+# should be copied before being modified
+@lru_cache(maxsize=1)
+def _get_default_cmps():
+    return Components.load_default()
+
+
+def _load_processes(path, components, conserved_for, parameters,
+                    create=None, to_class=None):
+    '''
+    Return a copy of the processes in the Gujer matrix of `path`,
+    or of those returned by `create(path, components, parameters)`,
+    compiled to `to_class`.
+
+    The compiled processes are cached, keyed by the inputs and the conversion
+    factors of the components for `conserved_for`, so that the stoichiometry
+    is solved again when any of these factors is changed in place.
+    `conserved_for` should include all materials conserved in any of the processes.
+    '''
+    ic = _ic_values(components, conserved_for)
+    return _build_processes(path, components, conserved_for, parameters,
+                            create, to_class, ic)._clone()
+
+@lru_cache(maxsize=64)
+def _build_processes(path, components, conserved_for, parameters,
+                     create, to_class, ic):
+    if create is None:
+        processes = Processes.load_from_file(path,
+                                             conserved_for=conserved_for,
+                                             parameters=parameters,
+                                             components=components,
+                                             compile=False)
+    else:
+        processes = create(path, components, parameters)
+    processes.compile(to_class=to_class)
+    return processes
+
+
+def __getattr__(name):
+    from importlib import import_module
+    if name in _LAZY:
+        obj = getattr(import_module(f'.{_LAZY[name]}', __name__), name)
+    elif name in set(_LAZY.values()):
+        obj = import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = obj
+    return obj
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
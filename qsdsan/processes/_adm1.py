@@ -645,7 +645,7 @@ class ADM1(CompiledProcesses):
             warn(f'ignored value setting for non-stoichiometric parameters {non_stoichio}')
         self.check_stoichiometric_parameters()
         if self._stoichio_lambdified is not None:
-            self.__dict__['_stoichio_lambdified'] = None
+            self.__dict__['_stoichio_lambdified'] = self.__dict__['_stoichio_T'] = None
 
     def check_stoichiometric_parameters(self):
         '''Check whether product COD fractions sum up to 1 for each process.'''
@@ -14,11 +14,13 @@ from thermosteam.utils import chemicals_user
 from thermosteam import settings
 from qsdsan import Components, Processes, CompiledProcesses
 from ..utils import ospath, data_path
+from . import _load_processes
 
 __all__ = ('create_asm1_cmps', 'ASM1')
 
 _path = ospath.join(data_path, 'process_data/_asm1.tsv')
 _load_components = settings.get_default_chemicals
+_conserved_for = ('COD', 'charge', 'N')
 
 ############# Components with default notation #############
 def create_asm1_cmps(set_thermo=True):
@@ -227,7 +229,8 @@ class ASM1(CompiledProcesses):
                 mu_H=4.0, K_S=10.0, K_O_H=0.2, K_NO=0.5, b_H=0.3, eta_g=0.8, eta_h=0.8,
                 k_h=3.0, K_X=0.1, mu_A=0.5, K_NH=1.0, b_A=0.05, K_O_A=0.4, k_a=0.05,
                 fr_SS_COD=0.75, path=None, **kwargs):
-        if not path: path = _path
+        # absolute path so that the cached processes are keyed by file, not by cwd
+        path = ospath.abspath(path) if path else _path
 
         cmps = _load_components(components)
         cmps.X_BH.i_N = cmps.X_BA.i_N = i_XB
@@ -235,12 +238,7 @@ class ASM1(CompiledProcesses):
         cmps.X_I.i_mass = cmps.X_S.i_mass = cmps.X_P.i_mass = cmps.X_BH.i_mass = cmps.X_BA.i_mass = fr_SS_COD
         cmps.refresh_constants()
 
-        self = Processes.load_from_file(path,
-                                        conserved_for=('COD', 'charge', 'N'),
-                                        parameters=cls._params,
-                                        components=cmps,
-                                        compile=False)
-        self.compile(to_class=cls)
+        self = _load_processes(path, cmps, _conserved_for, cls._params, to_class=cls)
 
         self.set_parameters(Y_A=Y_A, Y_H=Y_H, f_P=f_P, mu_H=mu_H, K_S=K_S, K_O_H=K_O_H,
                             K_NO=K_NO, b_H=b_H, eta_g=eta_g, eta_h=eta_h, k_h=k_h,
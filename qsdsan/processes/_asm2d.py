@@ -14,11 +14,14 @@ from thermosteam.utils import chemicals_user
 from thermosteam import settings
 from qsdsan import Components, Process, Processes, CompiledProcesses
 from ..utils import ospath, data_path
+from . import _load_processes
 
 __all__ = ('create_asm2d_cmps', 'ASM2d')
 
 _path = ospath.join(data_path, 'process_data/_asm2d.tsv')
 _load_components = settings.get_default_chemicals
+# materials conserved in any of the processes, for the cache key
+_conserved_for = ('COD', 'N', 'P', 'NOD', 'charge')
 
 ############# Components with default notation #############
 def create_asm2d_cmps(set_thermo=True):
@@ -220,6 +223,34 @@ def create_asm2d_cmps(set_thermo=True):
 #     K_ALK_PRE=0.5*12             # alkalinity half saturation coefficient for phosphate precipitation = 0.5 mol(HCO3-)/m^3 = 6.0 gC/m^3
 #     )
 
+def _create_processes(path, cmps, parameters):
+    pcs = Processes.load_from_file(path,
+                                   components=cmps,
+                                   conserved_for=('COD', 'N', 'P', 'charge'),
+                                   parameters=parameters,
+                                   compile=False)
+
+    if path == _path:
+        _p12 = Process('anox_storage_PP',
+                       'S_PO4 + [Y_PHA]X_PHA + [?]S_NO3 -> X_PP + [?]S_N2 + [?]S_NH4 + [?]S_ALK',
+                       components=cmps,
+                       ref_component='X_PP',
+                       rate_equation='q_PP * S_O2/(K_O2_PAO+S_O2) * S_PO4/(K_PS+S_PO4) * S_ALK/(K_ALK_PAO+S_ALK) * (X_PHA/X_PAO)/(K_PHA+X_PHA/X_PAO) * (K_MAX-X_PP/X_PAO)/(K_IPP+K_MAX-X_PP/X_PAO) * X_PAO * eta_NO3_PAO * K_O2_PAO/S_O2 * S_NO3/(K_NO3_PAO+S_NO3)',
+                       parameters=('Y_PHA', 'q_PP', 'K_O2_PAO', 'K_PS', 'K_ALK_PAO', 'K_PHA', 'eta_NO3_PAO', 'K_IPP', 'K_NO3_PAO'),
+                       conserved_for=('COD', 'N', 'P', 'NOD', 'charge'))
+
+        _p14 = Process('PAO_anox_growth',
+                       '[1/Y_PAO]X_PHA + [?]S_NO3 + [?]S_PO4 -> X_PAO + [?]S_N2 + [?]S_NH4  + [?]S_ALK',
+                       components=cmps,
+                       ref_component='X_PAO',
+                       rate_equation='mu_PAO * S_O2/(K_O2_PAO + S_O2) * S_NH4/(K_NH4_PAO + S_NH4) * S_PO4/(K_P_PAO + S_PO4) * S_ALK/(K_ALK_PAO + S_ALK) * (X_PHA/X_PAO)/(K_PHA + X_PHA/X_PAO) * X_PAO * eta_NO3_PAO * K_O2_PAO/S_O2 * S_NO3/(K_NO3_PAO + S_NO3)',
+                       parameters=('Y_PAO', 'mu_PAO', 'K_O2_PAO', 'K_NH4_PAO', 'K_P_PAO', 'K_ALK_PAO', 'K_PHA', 'eta_NO3_PAO', 'K_NO3_PAO'),
+                       conserved_for=('COD', 'N', 'P', 'NOD', 'charge'))
+        pcs.extend([_p12, _p14])
+
+    return pcs
+
+
 @chemicals_user
 class ASM2d(CompiledProcesses):
     '''
@@ -450,7 +481,8 @@ class ASM2d(CompiledProcesses):
                 k_PRE=1.0, k_RED=0.6, K_ALK_PRE=0.5,
                 path=None, **kwargs):
 
-        if not path: path = _path
+        # absolute path so that the cached processes are keyed by file, not by cwd
+        path = ospath.abspath(path) if path else _path
 
         cmps = _load_components(components)
         cmps.S_I.i_N = iN_SI
@@ -467,31 +499,8 @@ class ASM2d(CompiledProcesses):
         cmps.X_S.i_mass = iTSS_XS
         cmps.X_H.i_mass = cmps.X_PAO.i_mass = cmps.X_AUT.i_mass = iTSS_BM
 
-        self = Processes.load_from_file(path,
-                                        components=cmps,
-                                        conserved_for=('COD', 'N', 'P', 'charge'),
-                                        parameters=cls._params,
-                                        compile=False)
-
-        if path == _path:
-            _p12 = Process('anox_storage_PP',
-                           'S_PO4 + [Y_PHA]X_PHA + [?]S_NO3 -> X_PP + [?]S_N2 + [?]S_NH4 + [?]S_ALK',
-                           components=cmps,
-                           ref_component='X_PP',
-                           rate_equation='q_PP * S_O2/(K_O2_PAO+S_O2) * S_PO4/(K_PS+S_PO4) * S_ALK/(K_ALK_PAO+S_ALK) * (X_PHA/X_PAO)/(K_PHA+X_PHA/X_PAO) * (K_MAX-X_PP/X_PAO)/(K_IPP+K_MAX-X_PP/X_PAO) * X_PAO * eta_NO3_PAO * K_O2_PAO/S_O2 * S_NO3/(K_NO3_PAO+S_NO3)',
-                           parameters=('Y_PHA', 'q_PP', 'K_O2_PAO', 'K_PS', 'K_ALK_PAO', 'K_PHA', 'eta_NO3_PAO', 'K_IPP', 'K_NO3_PAO'),
-                           conserved_for=('COD', 'N', 'P', 'NOD', 'charge'))
-
-            _p14 = Process('PAO_anox_growth',
-                           '[1/Y_PAO]X_PHA + [?]S_NO3 + [?]S_PO4 -> X_PAO + [?]S_N2 + [?]S_NH4  + [?]S_ALK',
-                           components=cmps,
-                           ref_component='X_PAO',
-                           rate_equation='mu_PAO * S_O2/(K_O2_PAO + S_O2) * S_NH4/(K_NH4_PAO + S_NH4) * S_PO4/(K_P_PAO + S_PO4) * S_ALK/(K_ALK_PAO + S_ALK) * (X_PHA/X_PAO)/(K_PHA + X_PHA/X_PAO) * X_PAO * eta_NO3_PAO * K_O2_PAO/S_O2 * S_NO3/(K_NO3_PAO + S_NO3)',
-                           parameters=('Y_PAO', 'mu_PAO', 'K_O2_PAO', 'K_NH4_PAO', 'K_P_PAO', 'K_ALK_PAO', 'K_PHA', 'eta_NO3_PAO', 'K_NO3_PAO'),
-                           conserved_for=('COD', 'N', 'P', 'NOD', 'charge'))
-            self.extend([_p12, _p14])
-
-        self.compile(to_class=cls)
+        self = _load_processes(path, cmps, _conserved_for, cls._params,
+                               create=_create_processes, to_class=cls)
         self.set_parameters(f_SI=f_SI, Y_H=Y_H, f_XI_H=f_XI_H, Y_PAO=Y_PAO, Y_PO4=Y_PO4,
                             Y_PHA=Y_PHA, f_XI_PAO=f_XI_PAO, Y_A=Y_A, f_XI_AUT=f_XI_AUT,
                             K_h=K_h, eta_NO3=eta_NO3, eta_fe=eta_fe, K_O2=K_O2,
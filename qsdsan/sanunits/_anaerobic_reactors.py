@@ -19,7 +19,8 @@ import numpy as np
 from . import Decay
 from .. import SanUnit, Construction, WasteStream
 from ..sanunits import HXutility, WWTpump, CSTR
-from ..utils import ospath, load_data, data_path, auom, calculate_excavation_volume
+from ..utils import ospath, data_path, auom, calculate_excavation_volume
+from ..utils.loading import _load_expected
 __all__ = (
     'AnaerobicBaffledReactor',
     'AnaerobicCSTR',
@@ -27,6 +28,10 @@ __all__ = (
     'SludgeDigester',
     )
 
+_ft_to_m = auom('ft').conversion_factor('m')
+_Pa_to_bar = auom('Pa').conversion_factor('bar')
+_bar_to_Pa = auom('bar').conversion_factor('Pa')
+
 
 # %%
 
@@ -87,11 +92,8 @@ class AnaerobicBaffledReactor(SanUnit, Decay):
             Construction('excavation', linked_unit=self, item='Excavation', quantity_unit='m3'),
             )
 
-        data = load_data(path=abr_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(abr_path):
             setattr(self, '_'+para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -102,14 +104,16 @@ class AnaerobicBaffledReactor(SanUnit, Decay):
     def _run(self):
         waste = self.ins[0]
         treated, biogas, CH4, N2O = self.outs
-        treated.copy_like(self.ins[0])
+        treated.copy_like(waste)
         biogas.phase = CH4.phase = N2O.phase = 'g'
+        F_vol = waste.F_vol
+        COD_removal = self._COD_removal
 
         # COD removal
         _COD = waste._COD or waste.COD
-        COD_deg = _COD*waste.F_vol/1e3*self.COD_removal # kg/hr
-        treated._COD *= (1-self.COD_removal)
-        treated.imass[self.degraded_components] *= (1-self.COD_removal)
+        COD_deg = _COD*F_vol/1e3*COD_removal # kg/hr
+        treated._COD *= (1-COD_removal)
+        treated.imass[self.degraded_components] *= (1-COD_removal)
 
         CH4_prcd = COD_deg*self.MCF_decay*self.max_CH4_emission
         if self.if_capture_biogas:
@@ -119,12 +123,11 @@ class AnaerobicBaffledReactor(SanUnit, Decay):
             CH4.imass['CH4'] = CH4_prcd
             biogas.empty()
 
-        N_tot = waste.TN/1e3 * waste.F_vol
-        N_loss_tot = N_tot * self.N_removal
-        NH3_rmd, NonNH3_rmd = \
-            self.allocate_N_removal(N_loss_tot, waste.imass['NH3'])
-        treated.imass ['NH3'] = waste.imass['NH3'] - NH3_rmd
-        treated.imass['NonNH3'] = waste.imass['NonNH3'] - NonNH3_rmd
+        N_tot = waste.TN/1e3 * F_vol
+        N_loss_tot = N_tot * self._N_removal
+        NH3_in, NonNH3_in = waste.imass['NH3', 'NonNH3']
+        NH3_rmd, NonNH3_rmd = self.allocate_N_removal(N_loss_tot, NH3_in)
+        treated.imass['NH3', 'NonNH3'] = (NH3_in-NH3_rmd, NonNH3_in-NonNH3_rmd)
 
         if self.if_N2O_emission:
             N2O.imass['N2O'] = N_loss_tot*self.N_max_decay*self.N2O_EF_decay*44/28
@@ -141,23 +144,124 @@ class AnaerobicBaffledReactor(SanUnit, Decay):
 
     def _design(self):
         design = self.design_results
-        design['Residence time'] = self.tau
-        design['Reactor number'] = N = self.N_reactor
-        design['Baffle number'] = N_b = self.N_baffle
-        design['Reactor length'] = L = self.reactor_L
-        design['Reactor width'] = W = self.reactor_W
-        design['Reactor height'] = H = self.reactor_H
+        design['Residence time'] = self._tau
+        design['Reactor number'] = N = self._N_reactor
+        design['Baffle number'] = N_b = self._N_baffle
+        design['Reactor length'] = L = self._reactor_L
+        design['Reactor width'] = W = self._reactor_W
+        design['Reactor height'] = H = self._reactor_H
         design['Single reactor volume'] = V = L*W*H
 
-        constr = self.construction
-        concrete = N*self.concrete_thickness*(2*L*W+2*L*H+(2+N_b)*W*H)*self.add_concrete
-        constr[0].quantity = concrete
-        constr[1].quantity = N*V/(N_b+1) * self.gravel_density
-        constr[2].quantity = N * V # excavation
+        # `N` and `N_b` are already integers, so the quantities stay plain floats
+        quantities = self._construction_quantities(
+            N, N_b, L, W, H, self._concrete_thickness, self._add_concrete,
+            self.gravel_density)
+        for constr, quantity in zip(self.construction, quantities):
+            constr.quantity = quantity
 
         self.add_construction()
 
 
+    @staticmethod
+    def _construction_quantities(N, N_b, L, W, H, concrete_thickness,
+                                 add_concrete, gravel_density):
+        # shared by `_design` and `design_batch`, works with floats and arrays
+        V = L*W*H
+        concrete = N*concrete_thickness*(2*L*W+2*L*H+(2+N_b)*W*H)*add_concrete
+        gravel = N*V/(N_b+1) * gravel_density
+        excavation = N * V
+        return concrete, gravel, excavation
+
+
+    @staticmethod
+    def design_batch(N_reactor, N_baffle, reactor_L, reactor_W, reactor_H,
+                     concrete_thickness, add_concrete, gravel_density=1600):
+        '''
+        Calculate the construction quantities of many reactor configurations
+        at once, inputs can be floats or arrays of the same shape
+        (one element per configuration).
+
+        Parameters
+        ----------
+        N_reactor : float or numpy.ndarray
+            Number of reactors, will be converted to the smallest integer.
+        N_baffle : float or numpy.ndarray
+            Number of baffles per reactor, will be converted to the smallest integer.
+        reactor_L : float or numpy.ndarray
+            Reactor length, [m].
+        reactor_W : float or numpy.ndarray
+            Reactor width, [m].
+        reactor_H : float or numpy.ndarray
+            Reactor height, [m].
+        concrete_thickness : float or numpy.ndarray
+            Thickness of the concrete wall, [m].
+        add_concrete : float or numpy.ndarray
+            Additional concrete as a fraction of the reactor concrete usage.
+        gravel_density : float or numpy.ndarray, optional
+            Density of the gravel, [kg/m3]. The default is 1600.
+
+        Returns
+        -------
+        quantities : tuple
+            Concrete [m3], gravel [kg], and excavation [m3].
+        '''
+        return AnaerobicBaffledReactor._construction_quantities(
+            np.ceil(N_reactor), np.ceil(N_baffle), reactor_L, reactor_W, reactor_H,
+            concrete_thickness, add_concrete, gravel_density)
+
+
+    _batch_parameters = ('COD_removal', 'N_removal', 'MCF_decay',
+                         'max_CH4_emission', 'N_max_decay', 'N2O_EF_decay')
+    def run_batch(self, **parameters):
+        '''
+        Calculate the mass balance of many parameter sets at once with the
+        current influent, the unit itself is not updated.
+
+        Parameters
+        ----------
+        parameters : float or numpy.ndarray
+            Any of `COD_removal`, `N_removal`, `MCF_decay`, `max_CH4_emission`,
+            `N_max_decay`, and `N2O_EF_decay`, arrays should be of the same shape
+            (one element per parameter set).
+            Current values of the unit will be used for those not given.
+
+        Returns
+        -------
+        results : dict(numpy.ndarray)
+            Produced CH4 (captured or fugitive) and N2O [kg/hr],
+            remaining NH3 and NonNH3 [kg/hr] and COD [mg/L] in the treated waste.
+        '''
+        for name in parameters:
+            if name not in self._batch_parameters:
+                raise ValueError(f'Parameter "{name}" not recognized, '
+                                 f'must be in {self._batch_parameters}.')
+        values = (np.asarray(parameters.get(i, getattr(self, i)), dtype=float)
+                  for i in self._batch_parameters)
+        COD_removal, N_removal, MCF_decay, max_CH4_emission, N_max_decay, N2O_EF_decay = \
+            np.broadcast_arrays(*np.atleast_1d(*values))
+
+        waste = self.ins[0]
+        F_vol = waste.F_vol
+        _COD = waste._COD or waste.COD
+        COD_deg = _COD*F_vol/1e3*COD_removal # kg/hr
+        CH4 = COD_deg*MCF_decay*max_CH4_emission
+
+        N_loss_tot = waste.TN/1e3 * F_vol * N_removal
+        NH3_in, NonNH3_in = waste.imass['NH3', 'NonNH3']
+        # same allocation as `allocate_N_removal`, NH3 is removed first
+        NH3_rmd = np.minimum(NH3_in, N_loss_tot) if NH3_in > 0 else np.zeros_like(N_loss_tot)
+        N2O = N_loss_tot*N_max_decay*N2O_EF_decay*44/28 if self.if_N2O_emission \
+            else np.zeros_like(N_loss_tot)
+
+        return {
+            'CH4': CH4,
+            'N2O': N2O,
+            'NH3': NH3_in-NH3_rmd,
+            'NonNH3': NonNH3_in-(N_loss_tot-NH3_rmd),
+            'COD': _COD*(1-COD_removal),
+            }
+
+
     @property
     def tau(self):
         '''[float] Residence time, [d].'''
@@ -324,7 +428,7 @@ class AnaerobicCSTR(CSTR):
         '''Calculates the saturated vapor pressure at operation temperature.'''
         p = self.components.H2O.Psat(self.T)
         if convert_to_bar:
-            return p*auom('Pa').conversion_factor('bar')
+            return p*_Pa_to_bar
         else: return p
         
     @property
@@ -431,7 +535,7 @@ class AnaerobicCSTR(CSTR):
         liquid.copy_like(inf)
         gas.copy_like(self._biogas)
         if self._fixed_P_gas: 
-            gas.P = self.headspace_P * auom('bar').conversion_factor('Pa')
+            gas.P = self.headspace_P * _bar_to_Pa
         gas.T = self.T
         
     def _init_state(self):
@@ -597,11 +701,8 @@ class AnaerobicDigestion(SanUnit, Decay):
             Construction('excavation', linked_unit=self, item='Excavation', quantity_unit='m3'),
             )
 
-        data = load_data(path=ad_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(ad_path):
             setattr(self, '_'+para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -614,14 +715,16 @@ class AnaerobicDigestion(SanUnit, Decay):
     def _run(self):
         waste = self.ins[0]
         treated, biogas, CH4, N2O = self.outs
-        treated.copy_like(self.ins[0])
+        treated.copy_like(waste)
         biogas.phase = CH4.phase = N2O.phase = 'g'
+        F_vol = waste.F_vol
+        COD_removal = self._COD_removal
 
         # COD removal
         _COD = waste._COD or waste.COD
-        COD_deg = _COD*treated.F_vol/1e3*self.COD_removal # kg/hr
-        treated._COD *= (1-self.COD_removal)
-        treated.imass[self.degraded_components] *= (1-self.COD_removal)
+        COD_deg = _COD*F_vol/1e3*COD_removal # kg/hr
+        treated._COD *= (1-COD_removal)
+        treated.imass[self.degraded_components] *= (1-COD_removal)
 
         CH4_prcd = COD_deg*self.MCF_decay*self.max_CH4_emission
         if self.if_capture_biogas:
@@ -633,13 +736,12 @@ class AnaerobicDigestion(SanUnit, Decay):
 
         if self.if_N2O_emission:
             N_loss = self.first_order_decay(k=self.decay_k_N,
-                                            t=self.tau/365,
+                                            t=self._tau/365,
                                             max_decay=self.N_max_decay)
-            N_loss_tot = N_loss*waste.TN/1e3*waste.F_vol
-            NH3_rmd, NonNH3_rmd = \
-                self.allocate_N_removal(N_loss_tot, waste.imass['NH3'])
-            treated.imass['NH3'] = waste.imass['NH3'] - NH3_rmd
-            treated.imass['NonNH3'] = waste.imass['NonNH3'] - NonNH3_rmd
+            N_loss_tot = N_loss*waste.TN/1e3*F_vol
+            NH3_in, NonNH3_in = waste.imass['NH3', 'NonNH3']
+            NH3_rmd, NonNH3_rmd = self.allocate_N_removal(N_loss_tot, NH3_in)
+            treated.imass['NH3', 'NonNH3'] = (NH3_in-NH3_rmd, NonNH3_in-NonNH3_rmd)
             N2O.imass['N2O'] = N_loss_tot*self.N2O_EF_decay*44/28
         else:
             N2O.empty()
@@ -655,19 +757,20 @@ class AnaerobicDigestion(SanUnit, Decay):
     def _design(self):
         design = self.design_results
         design['Volumetric flow rate'] = Q = self.flow_rate
-        design['Residence time'] = tau = self.tau
-        design['Reactor number'] = N = self.N_reactor
+        design['Residence time'] = tau = self._tau
+        design['Reactor number'] = N = self._N_reactor
         V_tot = Q * tau*24
 
         # One extra as a backup
-        design['Single reactor volume'] = V_single = V_tot/(1-self.headspace_frac)/(N-1)
+        design['Single reactor volume'] = V_single = V_tot/(1-self._headspace_frac)/(N-1)
 
         # Rx modeled as a cylinder
-        design['Reactor diameter'] = D = (4*V_single*self.aspect_ratio/pi)**(1/3)
-        design['Reactor height'] = H = self.aspect_ratio * D
+        aspect_ratio = self._aspect_ratio
+        design['Reactor diameter'] = D = (4*V_single*aspect_ratio/pi)**(1/3)
+        design['Reactor height'] = H = aspect_ratio * D
 
         constr = self.construction
-        concrete =  N*self.concrete_thickness*(2*pi/4*(D**2)+pi*D*H)
+        concrete =  N*self._concrete_thickness*(2*pi/4*(D**2)+pi*D*H)
         constr[0].quantity = concrete
         constr[1].quantity = V_tot # excavation
 
@@ -868,8 +971,11 @@ class SludgeDigester(SanUnit):
         # Biogas production estimation based on Example 13-5 of Metcalf & Eddy, 5th edn.
         Y, b, SRT = self.Y, self.b, self.SRT
         organics_conversion, COD_factor = self.organics_conversion, self.COD_factor
-        methane_yield, methane_fraction = self.methane_yield, self.methane_fraction
-        biomass_COD = sludge.imass['active_biomass'].sum()*1e3*24*1.42 # [g/d], 1.42 converts VSS to COD
+        methane_yield = self.methane_yield
+        # group indices are cached by thermosteam, but each `imass` access
+        # still builds a new indexer, so the biomass flows are read once
+        biomass = sludge.imass['active_biomass']
+        biomass_COD = biomass.sum()*1e3*24*1.42 # [g/d], 1.42 converts VSS to COD
 
         digested.mass = sludge.mass
         digested.imass['active_biomass'] = 0 # biomass-derived COD calculated separately
@@ -882,12 +988,11 @@ class SludgeDigester(SanUnit):
 
         # Update stream flows
         digested.imass['substrates'] *= (1-organics_conversion)
-        digested.imass['active_biomass'] = \
-            sludge.imass['active_biomass']*(1-organics_conversion)
+        digested.imass['active_biomass'] = biomass*(1-organics_conversion)
 
         biogas.empty()
         biogas.ivol['CH4'] = methane_vol
-        biogas.ivol['CO2'] = methane_vol/methane_fraction*(1-methane_fraction)
+        biogas.ivol['CO2'] = methane_vol*self._CO2_per_CH4
 
 
     _units = {
@@ -934,9 +1039,8 @@ class SludgeDigester(SanUnit):
         self.heat_exchanger.simulate_as_auxiliary_exchanger(duty, sludge)
 
         # Concrete usage
-        ft_2_m = auom('ft').conversion_factor('m')
-        design['Wall concrete'] = self.t_wall * pi*(dia*ft_2_m)*(depth*ft_2_m+self.freeboard)
-        design['Slab concrete'] = 2 * self.t_slab * A*(ft_2_m**2) # floor and ceiling
+        design['Wall concrete'] = self.t_wall * pi*(dia*_ft_to_m)*(depth*_ft_to_m+self.freeboard)
+        design['Slab concrete'] = 2 * self.t_slab * A*(_ft_to_m**2) # floor and ceiling
 
         # Excavation
         design['Excavation'] = calculate_excavation_volume(
@@ -1039,4 +1143,13 @@ class SludgeDigester(SanUnit):
         return self._constr_access
     @constr_access.setter
     def constr_access(self, i):
-        self._constr_access = i
\ No newline at end of file
+        self._constr_access = i
+
+    @property
+    def methane_fraction(self):
+        '''[float] Fraction of methane in the biogas, the rest is assumed to be CO2.'''
+        return self._methane_fraction
+    @methane_fraction.setter
+    def methane_fraction(self, i):
+        self._methane_fraction = i
+        self._CO2_per_CH4 = (1-i)/i
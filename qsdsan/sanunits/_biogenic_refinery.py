@@ -26,7 +26,8 @@ from warnings import warn
 from math import ceil
 from .. import SanUnit, Construction
 from ._sludge_thickening import SludgeSeparator
-from ..utils import ospath, load_data, data_path, price_ratio
+from ..utils import ospath, data_path, price_ratio
+from ..utils.loading import _load_expected
 
 __all__ = (
     'BiogenicRefineryCarbonizerBase',
@@ -102,11 +103,8 @@ class BiogenicRefineryCarbonizerBase(SanUnit):
             Construction('electronics', linked_unit=self, item='Electronics', quantity_unit='kg'),
             )
 
-        data = load_data(path=br_carbonizer_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_carbonizer_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -279,11 +277,8 @@ class BiogenicRefineryControls(SanUnit):
             Construction('electric_cables', linked_unit=self, item='ElectricCables', quantity_unit='m'),
             )
 
-        data = load_data(path=br_control_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_control_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -371,11 +366,8 @@ class BiogenicRefineryGrinder(SanUnit):
             Construction('steel', linked_unit=self, item='Steel', quantity_unit='kg'),
             )
 
-        data = load_data(path=br_grinder_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_grinder_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -469,11 +461,8 @@ class BiogenicRefineryHHX(SanUnit):
             Construction('pump', linked_unit=self, item='Pump', quantity_unit='ea'),
             )
 
-        data = load_data(path=br_hhx_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_hhx_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -593,11 +582,8 @@ class BiogenicRefineryHHXdryer(SanUnit):
         SanUnit.__init__(self, ID, ins, outs, thermo=thermo, init_with=init_with, F_BM_default=1)
         self.moisture_content_out = moisture_content_out
 
-        data = load_data(path=br_hhx_dryer_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_hhx_dryer_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -695,11 +681,8 @@ class BiogenicRefineryHousing(SanUnit):
             Construction('concrete', item='Concrete', linked_unit=self, quantity_unit='m3'),
             )
 
-        data = load_data(path=br_housing_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_housing_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -778,11 +761,8 @@ class BiogenicRefineryIonExchange(SanUnit):
             Construction('pe', linked_unit=self, item='PE', quantity_unit='kg'),
             )
 
-        data = load_data(path=br_ix_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_ix_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -904,11 +884,8 @@ class BiogenicRefineryOHX(SanUnit):
             Construction('pump', linked_unit=self, item='Pump', quantity_unit='ea'),
             )
 
-        data = load_data(path=br_ohx_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_ohx_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -1001,11 +978,8 @@ class BiogenicRefineryPollutionControl(SanUnit):
             Construction('catalytic_converter', linked_unit=self, item='CatalyticConverter', quantity_unit='ea'),
             )
 
-        data = load_data(path=br_pollution_control_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_pollution_control_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -1127,11 +1101,8 @@ class BiogenicRefineryScrewPress(SludgeSeparator):
         self.construction = (
             Construction('steel', linked_unit=self, item='Steel', quantity_unit='kg'))
 
-        data = load_data(path=br_screw_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_screw_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -1223,11 +1194,8 @@ class BiogenicRefineryStruvitePrecipitation(SanUnit):
             Construction('pvc', linked_unit=self, item='PVC', quantity_unit='kg'),
             )
 
-        data = load_data(path=br_struvite_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(br_struvite_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -120,10 +120,9 @@ class Decay:
                                             t=self.tau/365,
                                             max_decay=self.N_max_decay)
             N_loss_tot = N_loss*waste.TN/1e3*waste.F_vol
-            NH3_rmd, NonNH3_rmd = \
-                self.allocate_N_removal(N_loss_tot, waste.imass['NH3'])
-            treated.imass ['NH3'] = waste.imass['NH3'] - NH3_rmd
-            treated.imass['NonNH3'] = waste.imass['NonNH3'] - NonNH3_rmd
+            NH3_in, NonNH3_in = waste.imass['NH3', 'NonNH3']
+            NH3_rmd, NonNH3_rmd = self.allocate_N_removal(N_loss_tot, NH3_in)
+            treated.imass['NH3', 'NonNH3'] = (NH3_in-NH3_rmd, NonNH3_in-NonNH3_rmd)
             N2O.imass['N2O'] = N_loss_tot*self.N2O_EF_decay*44/28
         else:
             N2O.empty()
@@ -26,7 +26,8 @@ for license details.
 from qsdsan import SanUnit, Construction
 from ._decay import Decay
 from ._septic_tank import SepticTank
-from ..utils import ospath, load_data, data_path, price_ratio
+from ..utils import ospath, data_path, price_ratio
+from ..utils.loading import _load_expected
 
 __all__ = (
     'EcoSanAerobic',
@@ -79,11 +80,8 @@ class EcoSanAerobic(SanUnit, Decay):
                        init_with=init_with, F_BM_default=1,
                        degraded_components=degraded_components)
 
-        data = load_data(path=aerobic_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(aerobic_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -131,11 +129,8 @@ class EcoSanAnaerobic(SanUnit, Decay):
                        init_with=init_with, F_BM_default=1,
                        degraded_components=degraded_components)
 
-        data = load_data(path=anaerobic_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(anaerobic_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -183,11 +178,8 @@ class EcoSanAnoxic(SanUnit, Decay):
                        init_with=init_with, F_BM_default=1,
                        degraded_components=degraded_components)
 
-        data = load_data(path=anoxic_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(anoxic_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -219,11 +211,8 @@ class EcoSanBioCost(SanUnit):
     def __init__(self, ID='', ins=None, outs=(), thermo=None, init_with='WasteStream', **kwargs):
         SanUnit.__init__(self, ID, ins, outs, thermo=thermo, init_with=init_with, F_BM_default=1)
 
-        data = load_data(path=bio_cost_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(bio_cost_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -309,11 +298,8 @@ class EcoSanECR(SanUnit, Decay):
 
     def _refresh_data(self):
         sheet_name = 'standalone' if not self.if_after_MBR else 'after_MBR'
-        data = load_data(path=ecr_path, sheet_name=sheet_name)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(ecr_path, sheet_name=sheet_name):
             setattr(self, para, value)
-        del data
 
     _N_ins = 3
     _N_outs = 3
@@ -426,11 +412,8 @@ class EcoSanMBR(SanUnit, Decay):
                        init_with=init_with, F_BM_default=1,
                        degraded_components=degraded_components)
 
-        data = load_data(path=mbr_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(mbr_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -516,11 +499,8 @@ class EcoSanPrimary(SepticTank):
 
     def _refresh_data(self):
         sheet_name = 'with_MBR' if not self.if_with_MBR else 'without_MBR'
-        data = load_data(path=primary_path, sheet_name=sheet_name)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(primary_path, sheet_name=sheet_name):
             setattr(self, para, value)
-        del data
 
 
     def _design(self):
@@ -592,11 +572,8 @@ class EcoSanSolar(SanUnit):
     def __init__(self, ID='', ins=None, outs=(), thermo=None, init_with='WasteStream', **kwargs):
         SanUnit.__init__(self, ID, ins, outs, thermo=thermo, init_with=init_with, F_BM_default=1)
 
-        data = load_data(path=solar_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(solar_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -646,11 +623,8 @@ class EcoSanSystem(SanUnit):
     def __init__(self, ID='', ins=None, outs=(), thermo=None, init_with='WasteStream', **kwargs):
         SanUnit.__init__(self, ID, ins, outs, thermo=thermo, init_with=init_with, F_BM_default=1)
 
-        data = load_data(path=system_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(system_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
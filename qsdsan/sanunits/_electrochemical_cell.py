@@ -16,7 +16,8 @@ for license details.
 
 # %%
 
-from .. import SanUnit, WasteStream
+import numpy as np
+from .. import SanUnit
 from ..equipments import Column, Electrode, Machine, Membrane
 
 __all__ = ('ElectrochemicalCell',)
@@ -74,6 +75,11 @@ class ElectrochemicalCell(SanUnit):
     ...                                 OPEX_over_CAPEX = 0.2)
     >>> # Simulate and look at the results
     >>> U1.simulate()
+    >>> # Outlet mass flows [kg/hr] of several recovery fractions at once
+    >>> rec, rem, left = U1.run_batch(recovery={'NH4OH': (0.5, 0.6)},
+    ...                               removal={'NH4OH': 0.2})
+    >>> rec[:, cmps.index('NH4OH')]
+    array([25., 30.])
     >>> # U1.diagram() # have a look at the diagram
     >>> U1.show() # doctest: +SKIP
     ElectrochemicalCell: U1
@@ -164,17 +170,59 @@ class ElectrochemicalCell(SanUnit):
         influent, cleaner = self.ins
         recovered, removed, left = self.outs[0], self.outs[1], self.outs[2]
 
-        mixture = WasteStream()
-        mixture.mix_from(self.ins)
-        left.copy_like(mixture)
-
-        for chemical, ratio in self.recovery.items():
-            recovered.imass[chemical] = mixture.imass[chemical]*ratio
-            left.imass[chemical] = left.imass[chemical]-mixture.imass[chemical]*ratio
-
-        for chemical, ratio in self.removal.items():
-            removed.imass[chemical] = mixture.imass[chemical]*ratio
-            left.imass[chemical] = left.imass[chemical]-mixture.imass[chemical]*ratio
+        left.mix_from(self.ins)
+
+        # all chemicals of a dict are indexed at once with a tuple of IDs,
+        # the fractions are of the mixture, so gather before updating `left`
+        separated = []
+        for out, fractions in ((recovered, self.recovery), (removed, self.removal)):
+            if not fractions: continue
+            IDs = tuple(fractions)
+            mass = left.imass[IDs] * np.fromiter(fractions.values(), dtype=float)
+            separated.append((out, IDs, mass))
+
+        for out, IDs, mass in separated:
+            out.imass[IDs] = mass
+            left.imass[IDs] = left.imass[IDs] - mass
+
+
+    def run_batch(self, recovery, removal):
+        '''
+        Calculate the outlet mass flows of many recovery/removal configurations
+        at once with the current influents, the unit itself is not updated.
+
+        Parameters
+        ----------
+        recovery : dict
+            Keys refer to chemical component IDs, values are the recovery fractions,
+            either floats or 1D arrays (one element per configuration).
+        removal : dict
+            Keys refer to chemical component IDs, values are the removal fractions,
+            either floats or 1D arrays (one element per configuration).
+
+        Returns
+        -------
+        mass : tuple(numpy.ndarray)
+            Mass flows [kg/hr] of the recovered, removed, and leftover streams,
+            each of shape (number of configurations, number of components).
+        '''
+        dcts = (recovery, removal)
+        N = max((np.size(i) for dct in dcts for i in dct.values()), default=1)
+        mixture = sum(np.asarray(i.mass, dtype=float) for i in self.ins)
+        get_index = self.ins[0].chemicals.get_index
+        left = np.tile(mixture, (N, 1))
+        separated = []
+        for dct in dcts:
+            mass = np.zeros_like(left)
+            if dct:
+                idx = get_index(tuple(dct))
+                frac = np.column_stack([np.broadcast_to(np.asarray(i, dtype=float), N)
+                                        for i in dct.values()])
+                mass[:, idx] = frac * mixture[idx]
+            separated.append(mass)
+        for mass in separated:
+            left -= mass
+        return (*separated, left)
 
 
     def _design(self):
@@ -15,7 +15,8 @@ for license details.
 # %%
 
 from .. import SanUnit
-from ..utils import ospath, load_data, data_path
+from ..utils import ospath, data_path
+from ..utils.loading import _load_expected
 
 __all__ = ('Excretion',)
 
@@ -55,11 +56,8 @@ class Excretion(SanUnit):
         SanUnit.__init__(self, ID, ins, outs, thermo, init_with)
         self.waste_ratio = waste_ratio
 
-        data = load_data(path=excretion_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(excretion_path):
             setattr(self, '_'+para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
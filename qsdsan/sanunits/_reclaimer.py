@@ -26,7 +26,8 @@ for license details.
 
 from math import ceil
 from qsdsan import SanUnit, Construction
-from ..utils import ospath, load_data, data_path, price_ratio
+from ..utils import ospath, data_path, price_ratio
+from ..utils.loading import _load_expected
 
 __all__ = (
     'ReclaimerECR',
@@ -80,11 +81,12 @@ class ReclaimerECR(SanUnit):
         self.ppl = ppl
         self.if_gridtied = if_gridtied
 
-        data = load_data(path=electrochemical_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        self.construction = (
+            Construction('titanium', linked_unit=self, item='Titanium', quantity_unit='kg'),
+            )
+
+        for para, value in _load_expected(electrochemical_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -96,7 +98,7 @@ class ReclaimerECR(SanUnit):
     def _design(self):
         design = self.design_results
         design['Titanium'] = electrode_quant = self.Titanium_weight * (self.ppl / self.baseline_ppl)  # linear scale
-        self.construction = Construction(item='Titanium', quantity=electrode_quant, quantity_unit='kg')
+        self.construction[0]._update_quantity(electrode_quant, 'kg')
         self.add_construction(add_cost=False)
 
     def _cost(self):
@@ -170,11 +172,13 @@ class ReclaimerHousing(SanUnit):
         SanUnit.__init__(self, ID, ins, outs, thermo=thermo, init_with=init_with, F_BM_default=1)
         self.ppl = ppl
 
-        data = load_data(path=housing_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        self.construction = (
+            Construction('steel', linked_unit=self, item='Steel', quantity_unit='kg'),
+            Construction('metal', linked_unit=self, item='Metal', quantity_unit='kg'),
+            )
+
+        for para, value in _load_expected(housing_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -188,10 +192,8 @@ class ReclaimerHousing(SanUnit):
             self.fittings_weight
             ) * (self.ppl / self.baseline_ppl)  # linear scale
         design['Metal'] = metal_quant = self.aluminum_weight * (self.ppl / self.baseline_ppl)  # linear scale
-        self.construction = (
-            Construction(item='Steel', quantity=steel_quant, quantity_unit='kg'),
-            Construction(item='Metal', quantity=metal_quant, quantity_unit='kg')
-            )
+        for constr, quant in zip(self.construction, (steel_quant, metal_quant)):
+            constr._update_quantity(quant, 'kg')
         self.add_construction(add_cost=False)
 
     def _cost(self):
@@ -279,11 +281,14 @@ class ReclaimerIonExchange(SanUnit):
         SanUnit.__init__(self, ID, ins, outs, thermo=thermo, init_with=init_with, F_BM_default=1)
         self.ppl = ppl
 
-        data = load_data(path=ion_exchange_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        self.construction = (
+            Construction('plastic', linked_unit=self, item='Plastic', quantity_unit='kg'),
+            Construction('pvc', linked_unit=self, item='PVC', quantity_unit='kg'),
+            Construction('steel', linked_unit=self, item='Steel', quantity_unit='kg'),
+            )
+
+        for para, value in _load_expected(ion_exchange_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -310,9 +315,10 @@ class ReclaimerIonExchange(SanUnit):
         KCl_demand_time = (self.KCl_weight / (self.KCl_regeneration_freq * 365 * 24)) * N  # kg KCl/hr
         KCl.imass['PotassiumChloride'] = KCl_demand_time
 
-        N_removed = waste.imass['NH3'] * self.TN_removal
+        NH3_in = waste.imass['NH3']
+        N_removed = NH3_in * self.TN_removal
         N_recovered = N_removed * self.desorption_recovery_efficiency  # kg N / hr
-        treated.imass['NH3'] = waste.imass['NH3'] - N_removed  # kg N / hr
+        treated.imass['NH3'] = NH3_in - N_removed  # kg N / hr
         conc_NH3.imass['NH3'] = N_recovered  # kg N / hr
 
         # Not sure why KCl was added to the concentrated NH3 stream - Hannah Lohman 6/6/2022
@@ -326,11 +332,8 @@ class ReclaimerIonExchange(SanUnit):
         design['PVC'] = PVC_quant = self.PVC_weight * factor
         design['Steel'] = S_quant = self.Steel_weight * factor
 
-        self.construction = (
-            Construction(item='Plastic', quantity=P_quant, quantity_unit='kg'),
-            Construction(item='PVC', quantity=PVC_quant, quantity_unit='kg'),
-            Construction(item='Steel', quantity=S_quant, quantity_unit='kg'),
-            )
+        for constr, quant in zip(self.construction, (P_quant, PVC_quant, S_quant)):
+            constr._update_quantity(quant, 'kg')
         self.add_construction(add_cost=False)
 
     def _cost(self):
@@ -420,11 +423,8 @@ class ReclaimerSolar(SanUnit):
     def __init__(self, ID='', ins=None, outs=(), thermo=None, init_with='WasteStream', **kwargs):
         SanUnit.__init__(self, ID, ins, outs, thermo=thermo, init_with=init_with, F_BM_default=1)
 
-        data = load_data(path=solar_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(solar_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -505,11 +505,12 @@ class ReclaimerSystem(SanUnit):
         self.ppl = ppl
         self.if_gridtied = if_gridtied
 
-        data = load_data(path=system_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        self.construction = (
+            Construction('steel', linked_unit=self, item='Steel', quantity_unit='kg'),
+            )
+
+        for para, value in _load_expected(system_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -518,7 +519,7 @@ class ReclaimerSystem(SanUnit):
     def _design(self):
         design = self.design_results
         design['Steel'] = steel_quant = self.steel_weight * (self.ppl / self.baseline_ppl)  # linear scale
-        self.construction = Construction(item='Steel', quantity=steel_quant, quantity_unit='kg')
+        self.construction[0]._update_quantity(steel_quant, 'kg')
         self.add_construction(add_cost=False)
 
     def _cost(self):
@@ -614,11 +615,13 @@ class ReclaimerUltrafiltration(SanUnit):
         self.if_gridtied = if_gridtied
         self.ppl = ppl
 
-        data = load_data(path=ultrafiltration_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        self.construction = (
+            Construction('plastic', linked_unit=self, item='Plastic', quantity_unit='kg'),
+            Construction('steel', linked_unit=self, item='Steel', quantity_unit='kg'),
+            )
+
+        for para, value in _load_expected(ultrafiltration_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -640,8 +643,8 @@ class ReclaimerUltrafiltration(SanUnit):
         design['Plastic'] = plastic_quant = self.Plastic_weight * factor
         design['Steel'] = steel_quant = self.Steel_weight * factor
 
-        self.construction = (Construction(item='Plastic', quantity=plastic_quant, quantity_unit='kg'),
-                             Construction(item='Steel', quantity=steel_quant, quantity_unit='kg'))
+        for constr, quant in zip(self.construction, (plastic_quant, steel_quant)):
+            constr._update_quantity(quant, 'kg')
 
         self.add_construction(add_cost=False)
 
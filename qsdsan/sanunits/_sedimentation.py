@@ -18,7 +18,8 @@ for license details.
 from math import ceil, pi, cos
 from . import Decay, SludgeSeparator
 from .. import Construction
-from ..utils import ospath, load_data, data_path
+from ..utils import ospath, data_path
+from ..utils.loading import _load_expected
 
 __all__ = ('Sedimentation',)
 
@@ -74,11 +75,8 @@ class Sedimentation(SludgeSeparator, Decay):
             Construction('steel', linked_unit=self, item='Steel', quantity_unit='kg'),
             )
 
-        data = load_data(path=sedmentation_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(sedmentation_path):
             setattr(self, '_'+para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
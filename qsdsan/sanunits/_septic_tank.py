@@ -15,7 +15,8 @@ for license details.
 
 from qsdsan import SanUnit, Construction
 from ._decay import Decay
-from ..utils import ospath, load_data, data_path, price_ratio
+from ..utils import ospath, data_path, price_ratio
+from ..utils.loading import _load_expected
 
 __all__ = ('SepticTank',)
 
@@ -85,11 +86,8 @@ class SepticTank(SanUnit, Decay):
         self.ppl = ppl
         self.sludge_moisture_content = sludge_moisture_content
 
-        data = load_data(path=septic_tank_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(septic_tank_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -114,10 +112,9 @@ class SepticTank(SanUnit, Decay):
         # N decay
         N_loss = self.first_order_decay(k=self.decay_k_N, t=self.tau/365, max_decay=self.N_max_decay)
         N_loss_tot = N_loss*waste.TN/1e3*waste.F_vol
-        NH3_rmd, NonNH3_rmd = \
-            self.allocate_N_removal(N_loss_tot, waste.imass['NH3'])
-        treated.imass['NH3'] = waste.imass['NH3'] - NH3_rmd
-        treated.imass['NonNH3'] = waste.imass['NonNH3'] - NonNH3_rmd
+        NH3_in, NonNH3_in = waste.imass['NH3', 'NonNH3']
+        NH3_rmd, NonNH3_rmd = self.allocate_N_removal(N_loss_tot, NH3_in)
+        treated.imass['NH3', 'NonNH3'] = (NH3_in-NH3_rmd, NonNH3_in-NonNH3_rmd)
         N2O.imass['N2O'] = N_loss_tot * self.N2O_EF_decay * 44/28
 
         # P recovery
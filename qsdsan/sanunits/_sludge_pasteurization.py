@@ -17,7 +17,8 @@ for license details.
 from math import ceil
 from thermosteam.reaction import ParallelReaction
 from .. import SanUnit, Construction
-from ..utils import ospath, load_data, data_path, price_ratio
+from ..utils import ospath, data_path, price_ratio
+from ..utils.loading import _load_expected
 
 __all__ = ('SludgePasteurization',)
 
@@ -126,11 +127,8 @@ class SludgePasteurization(SanUnit):
         self.exponent_scale = exponent_scale
         self.if_sludge_service = if_sludge_service
 
-        data = load_data(path=pasteurization_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(pasteurization_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -23,6 +23,7 @@ from warnings import warn
 from . import Decay
 from .. import SanUnit, WasteStream, Construction
 from ..utils import ospath, load_data, data_path, dct_from_str, price_ratio
+from ..utils.loading import _load_expected
 
 __all__ = ('Toilet', 'PitLatrine', 'UDDT', 'MURT',)
 
@@ -111,14 +112,11 @@ class Toilet(SanUnit, Decay, isabstract=True):
         self.OPEX_over_CAPEX = OPEX_over_CAPEX
         self.price_ratio = price_ratio
 
-        data = load_data(path=toilet_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(toilet_path):
             if para in ('desiccant_V', 'desiccant_rho'):
                 setattr(self, para, value)
             else:
                 setattr(self, '_'+para, value)
-        del data
 
         self._empty_ratio = 0.59
 
@@ -731,11 +729,8 @@ class UDDT(Toilet):
             Construction('wood', linked_unit=self, item='Wood', quantity_unit='m3'),
             )
 
-        data = load_data(path=uddt_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(uddt_path):
             setattr(self, '_'+para, value)
-        del data
 
         self._tank_V = 60/1e3 # m3
         for attr, value in kwargs.items():
@@ -1064,11 +1059,8 @@ class MURT(Toilet):
         self.if_include_front_end = if_include_front_end
         self._mixed = WasteStream(f'{self.ID}_mixed')
 
-        data = load_data(path=murt_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
+        for para, value in _load_expected(murt_path):
             setattr(self, para, value)
-        del data
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
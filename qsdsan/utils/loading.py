@@ -17,6 +17,7 @@ path = ospath.dirname(ospath.realpath(__file__))
 qs_path = ospath.realpath(ospath.join(ospath.dirname(__file__), '../'))
 data_path = ospath.join(qs_path, 'data')
 
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 from warnings import warn
@@ -58,6 +59,15 @@ def load_data(path=None, sheet=None, index_col=0, **kwargs):
     return data
 
 
+# The default parameter values are the same for all units loading the same
+# data file, so the file is only parsed once
+@lru_cache(maxsize=None)
+def _load_expected(path, **kwargs):
+    '''Return the (parameter, float value) pairs of the "expected" column.'''
+    data = load_data(path=path, **kwargs)
+    return tuple((para, float(value)) for para, value in zip(data.index, data['expected']))
+
+
 
 # %%
 
@@ -70,9 +80,8 @@ def save_pickle(obj, path):
     if _pk is None:
         raise RuntimeError('Current environment does not support Pickle Protocol 5, '
                            'cannot save pickle files.')
-    f = open(path, 'wb')
-    _pk.dump(obj, f, protocol=5)
-    f.close()
+    with open(path, 'wb') as f:
+        _pk.dump(obj, f, protocol=5)
 
 
 def load_pickle(path):
@@ -80,10 +89,11 @@ def load_pickle(path):
     if _pk is None:
         raise RuntimeError('Current environment does not support Pickle Protocol 5, '
                            'cannot load pickle files.')
-    f = open(path, 'rb')
-    obj = _pk.load(f)
-    f.close()
-    return obj
+    # read the file in one call instead of letting the unpickler issue
+    # many small reads, the file is closed even if unpickling fails
+    with open(path, 'rb') as f:
+        data = f.read()
+    return _pk.loads(data)
 
 
 def load_pickled_cmps(components_creation_f, pickle_path, pickle=None):
@@ -13,6 +13,7 @@ for license details.
 '''
 
 import numpy as np
+from functools import lru_cache
 from sympy import symbols, sympify, simplify, Matrix, solve
 from sympy.parsing.sympy_parser import parse_expr
 from . import auom
@@ -107,28 +108,58 @@ def get_ic(cmps, conservation_for):
         return Matrix(arr.tolist())
     else: return None
 
+# the same coefficients (e.g., "1", "-1/Y_H") are repeated across processes
+# and models, and simplification of the parsed expressions is the bulk of
+# the parsing time
+@lru_cache(maxsize=1024)
+def _parse_coeff(coeff, parameters):
+    expr = parse_expr(coeff, local_dict=dict(parameters))
+    return expr if expr.is_Atom else simplify(expr)
+
+# solving for the unknown coefficients is the bulk of the time of loading
+# a process model, the solution only depends on the reaction and the conversion
+# factors of the involved components, so it can be shared across components
+# objects and models with the same conversion factors
+@lru_cache(maxsize=256)
+def _solve_unknowns(coeffs, ic, parameters):
+    n = sum([v in ('?', '-(?)') for v in coeffs])
+    unknowns = symbols('unknown0:%s' % n)
+    i = 0
+    v_arr = []
+    for coeff in coeffs:
+        if coeff in ('?', '-(?)'):
+            v_arr.append('unknown%s' % i)
+            i += 1
+        else: v_arr.append(coeff)
+    v = Matrix(sympify(v_arr, dict(parameters)))
+    ic = Matrix(ic) if ic else None
+    sol = solve(simplify(ic * v).as_expr(), unknowns)
+    # sol = solve(ic * v, unknowns)
+    # return tuple(simplify(v.subs(sol)))
+    return tuple(v.subs(sol))
+
+def _ic_values(cmps, conserved_for):
+    '''
+    Return the conversion factors of the components for the conserved materials
+    as a tuple of tuples, same values as `get_ic(cmps, conserved_for)`,
+    but read from the components so that unrefreshed constants are respected.
+    '''
+    if not conserved_for: return ()
+    return tuple(tuple(float(getattr(cmp, 'i_'+x)) for cmp in cmps)
+                 for x in conserved_for)
+
 def symbolize(coeff_dct, components, conserved_for, parameters):
     n = sum([v in ('?', '-(?)') for v in coeff_dct.values()])
     if n > 0:
-        unknowns = symbols('unknown0:%s' % n)
-        i = 0
-        v_arr = []
         IDs = sorted(coeff_dct)
-        for cmp in IDs:
-            if coeff_dct[cmp] in ('?', '-(?)'):
-                v_arr.append('unknown%s' % i)
-                i += 1
-            else: v_arr.append(coeff_dct[cmp])
-        v = Matrix(sympify(v_arr, parameters))
-        ic = get_ic(components.subgroup(IDs), conserved_for)
-        sol = solve(simplify(ic * v).as_expr(), unknowns)
-        # sol = solve(ic * v, unknowns)
-        # coeff_dct = dict(zip(IDs, simplify(v.subs(sol))))
-        coeff_dct = dict(zip(IDs, v.subs(sol)))
-        del unknowns
+        ic = _ic_values(components[IDs], conserved_for)
+        params = tuple(parameters.items()) if parameters else ()
+        coeffs = _solve_unknowns(tuple(coeff_dct[i] for i in IDs), ic, params)
+        coeff_dct = dict(zip(IDs, coeffs))
     else:
         isa = isinstance
-        coeff_dct = {k: simplify(parse_expr(v, local_dict=parameters)) \
+        params = tuple(parameters.items()) if parameters else ()
+        coeff_dct = {k: _parse_coeff(v, params) \
                      if isa(v, str) else v for k, v in coeff_dct.items()}
     return coeff_dct
 
@@ -12,7 +12,10 @@ for license details.
 
 
 
-__all__ = ('test_process',)
+__all__ = ('test_process', 'test_process_clones', 'test_process_batch_eval',
+           'test_process_parallel_precision', 'test_process_lsoda_rhs', 'test_process_lsoda',
+           'test_process_defaults', 'test_sharon_cmps', 'test_sharon_parameters',
+           'test_asm_rebuild',)
 
 def test_process():
     import pytest, os, qsdsan.processes as pc
@@ -119,5 +122,234 @@ def test_process():
     pc.create_asm2d_cmps()
         
 
+def _load_cando3_cmps():
+    from qsdsan.processes._CANDO3 import _create_CANDO3_cmps
+    return _create_CANDO3_cmps()
+
+def _state_arrs(cmps, n=5):
+    import numpy as np
+    rng = np.random.default_rng(1)
+    return rng.uniform(0.1, 10, (n, len(cmps)))
+
+def test_process_clones():
+    import numpy as np
+    from numpy.testing import assert_allclose
+    from qsdsan import set_thermo, processes as pc
+
+    cmps = _load_cando3_cmps()
+    set_thermo(cmps)
+    state_arr = _state_arrs(cmps, 1)[0]
+
+    # clones of the cached processes should not share any mutable state
+    p1 = pc.CANDO3()
+    p2 = pc.CANDO3()
+    rho2 = p2.rate_function(state_arr).copy()
+    stoichio2 = p2.stoichio_eval().copy()
+    prod2 = p2.production_rates_eval(state_arr).copy()
+
+    p1.set_parameters(Y_H=0.5, mu1_hb_ss=9.)
+    p1.set_jit()
+    p1.set_precision('f32')
+    p1.production_rates_eval(state_arr)
+    assert p1.stoichio_eval().dtype == np.float32
+
+    for p in (p2, pc.CANDO3()):
+        assert p.parameters['Y_H'] == 0.4
+        assert not p.__dict__.get('_jit')
+        assert p.stoichio_eval().dtype == np.float64
+        assert_allclose(p.rate_function(state_arr), rho2, rtol=0)
+        assert_allclose(p.stoichio_eval(), stoichio2, rtol=0)
+        assert_allclose(p.production_rates_eval(state_arr), prod2, rtol=0)
+
+    # stoichiometry should be solved again after the components are changed in place
+    cmps.X_PAO.i_N = 0.1
+    cmps.refresh_constants()
+    stoichio = pc.CANDO3().stoichio_eval()
+    # the last process (anoxic growth of PAO) is balanced for N
+    assert abs(stoichio[-1] @ cmps.i_N) < 1e-8
+    assert abs(stoichio2[-1] @ cmps.i_N) > 1e-3
+
+def test_process_batch_eval():
+    import numpy as np
+    from numpy.testing import assert_allclose
+    from qsdsan import set_thermo, processes as pc
+
+    cmps = _load_cando3_cmps()
+    set_thermo(cmps)
+    state_arrs = _state_arrs(cmps)
+
+    for jit in (False, True):
+        p = pc.CANDO3(jit=jit)
+        rhos = p.rate_eval_batch(state_arrs)
+        assert rhos.shape == (len(state_arrs), p.size)
+        assert_allclose(rhos, [p.rate_function(i).copy() for i in state_arrs], rtol=1e-12)
+        assert_allclose(p.production_rates_eval_batch(state_arrs),
+                        [p.production_rates_eval(i).copy() for i in state_arrs], rtol=1e-10)
+
+def test_process_parallel_precision():
+    import numpy as np
+    from numpy.testing import assert_allclose
+    from qsdsan import set_thermo, processes as pc, _process
+
+    cmps = _load_cando3_cmps()
+    set_thermo(cmps)
+    # enough samples to be split across threads
+    state_arrs = _state_arrs(cmps, 1000)
+
+    p64 = pc.CANDO3()
+    rhos = p64.rate_eval_batch(state_arrs)
+    prods = p64.production_rates_eval_batch(state_arrs)
+
+    # parallel jit kernel
+    p_jit = pc.CANDO3(jit=True)
+    info = _process._jit_rate_batch_function.cache_info
+    n_calls = info().hits + info().misses
+    assert_allclose(p_jit.rate_eval_batch(state_arrs), rhos, rtol=1e-12)
+    # production rates of some components are sums with cancellation
+    assert_allclose(p_jit.production_rates_eval_batch(state_arrs), prods,
+                    rtol=1e-12, atol=1e-12*np.abs(prods).max())
+    # the parallel kernel was used for both evaluations
+    assert info().hits + info().misses == n_calls + 2
+
+    # single-precision stoichiometry
+    p32 = pc.CANDO3(precision='f32')
+    assert p32.stoichio_eval().dtype == np.float32
+    for state_arr in state_arrs[:10]:
+        assert_allclose(p32.production_rates_eval(state_arr),
+                        p64.production_rates_eval(state_arr), rtol=1e-4, atol=1e-4)
+    assert_allclose(p32.production_rates_eval_batch(state_arrs), prods, rtol=1e-4, atol=1e-4)
+
+def test_process_lsoda_rhs():
+    import ctypes, numpy as np
+    from numpy.testing import assert_allclose
+    from qsdsan import set_thermo, processes as pc
+
+    # the right-hand side for `solve_lsoda` can be checked without `numbalsoda`
+    cmps = _load_cando3_cmps()
+    set_thermo(cmps)
+    p = pc.CANDO3()
+    rhs = p._lsoda_function()
+    as_ptr = lambda arr: arr.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+    dy, data = np.zeros(len(cmps)), np.zeros(1)
+    stoichio_T = p.stoichio_eval().T
+    for y in _state_arrs(cmps):
+        rhs.ctypes(0., as_ptr(y), as_ptr(dy), as_ptr(data))
+        prods = p.production_rates_eval(y)
+        assert_allclose(dy, prods, rtol=1e-10, atol=1e-12*np.abs(prods).max())
+        assert_allclose(dy, stoichio_T @ p.rate_function(y), rtol=1e-10,
+                        atol=1e-12*np.abs(prods).max())
+
+def test_process_lsoda():
+    import pytest, numpy as np
+    from numpy.testing import assert_allclose
+    from scipy.integrate import solve_ivp
+    from qsdsan import set_thermo, processes as pc
+    pytest.importorskip('numbalsoda')
+
+    cmps = _load_cando3_cmps()
+    set_thermo(cmps)
+    p = pc.CANDO3()
+    y0 = _state_arrs(cmps, 1)[0]
+    t_eval = np.linspace(0, 0.1, 11)
+
+    usol, success = p.solve_lsoda(y0, t_eval, rtol=1e-8, atol=1e-10)
+    assert success
+    assert not np.allclose(usol[-1], y0)
+    sol = solve_ivp(lambda t, y: p.production_rates_eval(y), (t_eval[0], t_eval[-1]),
+                    y0, method='LSODA', t_eval=t_eval, rtol=1e-8, atol=1e-10)
+    assert sol.success
+    assert_allclose(usol, sol.y.T, rtol=1e-5, atol=1e-6)
+
+def test_process_defaults():
+    from inspect import signature, Parameter
+    from qsdsan import processes as pc
+
+    # `_DEFAULTS` should hold the same parameters and values as the signature
+    others = {'components', 'fr_SS_COD', 'jit', 'precision', 'path', 'kwargs'}
+    for cls in (pc.CANDO, pc.CANDO3, pc.Sharon):
+        kwargs = signature(cls.__new__).parameters
+        defaults = {k: v.default for k, v in kwargs.items()
+                    if k != 'cls' and k not in others}
+        assert defaults == dict(cls._DEFAULTS), cls.__name__
+        assert others <= set(kwargs)
+        assert kwargs['kwargs'].kind is Parameter.VAR_KEYWORD
+
+def test_sharon_cmps():
+    from numpy.testing import assert_allclose
+    from qsdsan import set_thermo, processes as pc
+    from qsdsan.processes import _Sharon
+
+    # the pickled components should be the same as the created ones
+    created = _Sharon._create_Sharon_cmps()
+    loaded = pc.load_Sharon_cmps()
+    assert loaded is pc.load_Sharon_cmps()
+    assert created.IDs == loaded.IDs
+    assert_allclose(created.i_N, loaded.i_N, rtol=1e-12)
+    assert_allclose(created.i_COD, loaded.i_COD, rtol=1e-12)
+
+    p_created = pc.Sharon(components=created)
+    set_thermo(loaded)
+    p_loaded = pc.Sharon()
+    assert p_created.IDs == p_loaded.IDs
+    assert_allclose(p_created.stoichiometry.to_numpy(dtype=float),
+                    p_loaded.stoichiometry.to_numpy(dtype=float), rtol=1e-12)
+
+def test_sharon_parameters():
+    import numpy as np
+    from inspect import signature
+    from qsdsan import set_thermo, processes as pc
+    from qsdsan.processes import _Sharon
+
+    cmps = _Sharon._create_Sharon_cmps()
+    set_thermo(cmps)
+    p = pc.Sharon()
+
+    # the defaults should be the parameters in the signature of `Sharon`
+    kwargs = set(signature(pc.Sharon.__new__).parameters)
+    assert set(_Sharon._SHARON_DEFAULTS) <= kwargs
+    assert set(p.parameters) == set(_Sharon._SHARON_DEFAULTS)
+
+    # all symbols in the rate equations and the stoichiometry should be bound
+    free = set()
+    for eq in p._rate_equations: free.update(eq.free_symbols)
+    for row in p._stoichiometry:
+        for v in row: free.update(getattr(v, 'free_symbols', ()))
+    free = {str(i) for i in free} - set(cmps.IDs)
+    assert free <= set(p.parameters)
+    # the methanol oxidation rate in the Gujer matrix uses `K_nit_HNO2` and `K_nit_O2`
+    assert set(p.parameters) - free == {'K_hetox_CH3OH', 'K_het_O2'}
+    assert all(isinstance(v, (float, int)) for v in p.parameters.values())
+    assert p.rate_function(np.ones(len(cmps))).shape == (p.size,)
+
+def test_asm_rebuild():
+    from numpy.testing import assert_allclose
+    from qsdsan import processes as pc
+
+    # stoichiometry should be solved again after a component is changed in place
+    for create_cmps, model, ID in ((pc.create_asm1_cmps, pc.ASM1, 'X_S'),
+                                   (pc.create_asm2d_cmps, pc.ASM2d, 'X_PHA')):
+        cmps = create_cmps()
+        stoichio0 = model().stoichio_eval().copy()
+        getattr(cmps, ID).i_N = 0.01
+        cmps.refresh_constants()
+        stoichio1 = model().stoichio_eval()
+        assert abs(stoichio1 - stoichio0).max() > 1e-3
+
+        # same as building from a new components object
+        new = create_cmps(set_thermo=False)
+        getattr(new, ID).i_N = 0.01
+        new.refresh_constants()
+        assert_allclose(model(components=new).stoichio_eval(), stoichio1, rtol=1e-12)
+
+
 if __name__ == '__main__':
-    test_process()
\ No newline at end of file
+    test_process()
+    test_process_clones()
+    test_process_batch_eval()
+    test_process_parallel_precision()
+    test_process_lsoda_rhs()
+    test_process_lsoda()
+    test_process_defaults()
+    test_sharon_cmps()
+    test_sharon_parameters()
+    test_asm_rebuild()
\ No newline at end of file
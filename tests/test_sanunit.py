@@ -12,7 +12,7 @@ Please refer to https://github.com/QSD-Group/QSDsan/blob/main/LICENSE.txt
 for license details.
 '''
 
-__all__ = ('test_sanunit',)
+__all__ = ('test_sanunit', 'test_abr_design_batch', 'test_abr_run_batch',)
 
 def test_sanunit():
     from numpy.testing import assert_allclose
@@ -56,5 +56,103 @@ def test_sanunit():
     assert_allclose(M4.installed_cost, 7237.455247692897, rtol=1e-2)
 
 
+def _create_abr_cmps():
+    import qsdsan as qs
+    kw = dict(particle_size='Soluble', degradability='Undegradable', organic=False)
+    H2O = qs.Component.from_chemical('H2O', phase='l', **kw)
+    NH3 = qs.Component.from_chemical('NH3', phase='l', measured_as='N', **kw)
+    NonNH3 = qs.Component('NonNH3', formula='N', phase='l', measured_as='N', **kw)
+    CH4 = qs.Component.from_chemical('CH4', phase='g', particle_size='Dissolved gas',
+                                     degradability='Undegradable', organic=True)
+    N2O = qs.Component.from_chemical('N2O', phase='g', particle_size='Dissolved gas',
+                                     degradability='Undegradable', organic=False)
+    OtherSS = qs.Component('OtherSS', phase='l', MW=1, **kw)
+    cmps = qs.Components((H2O, NH3, NonNH3, CH4, N2O, OtherSS))
+    for cmp in cmps:
+        cmp.copy_models_from(H2O, names=('V',))
+        cmp.default()
+    qs.set_thermo(cmps)
+    for ID, unit in (('Concrete', 'm3'), ('Gravel', 'kg'), ('Excavation', 'm3')):
+        qs.ImpactItem(ID, functional_unit=unit)
+    return cmps
+
+def test_abr_design_batch():
+    import numpy as np
+    from numpy.testing import assert_allclose
+    import qsdsan as qs
+
+    _create_abr_cmps()
+    ABR = qs.sanunits.AnaerobicBaffledReactor
+    U1 = ABR(ins=qs.WasteStream(H2O=1000, NH3=5, NonNH3=2, OtherSS=10))
+
+    configs = {'N_reactor': np.array([1, 2, 3.5]),
+               'N_baffle': np.array([2, 4, 5]),
+               'reactor_L': np.array([17., 10., 12.]),
+               'reactor_W': np.array([5., 4., 3.]),
+               'reactor_H': np.array([2.5, 2., 3.]),
+               'concrete_thickness': np.array([0.3, 0.2, 0.25]),
+               'add_concrete': np.array([0.25, 0.1, 0.2])}
+    quantities = []
+    for i in range(3):
+        for k, v in configs.items(): setattr(U1, k, v[i])
+        U1._design()
+        # scalar design without numpy types
+        assert all(type(constr.quantity) is float for constr in U1.construction)
+        quantities.append([constr.quantity for constr in U1.construction])
+    batch = ABR.design_batch(**configs, gravel_density=U1.gravel_density)
+    assert_allclose(np.column_stack(batch), quantities, rtol=1e-12)
+
+    # default reactor
+    U2 = ABR(ins=qs.WasteStream(H2O=1000, NH3=5, NonNH3=2, OtherSS=10))
+    U2._design()
+    default = ABR.design_batch(U2.N_reactor, U2.N_baffle, U2.reactor_L,
+                               U2.reactor_W, U2.reactor_H, U2.concrete_thickness,
+                               U2.add_concrete, U2.gravel_density)
+    assert_allclose([constr.quantity for constr in U2.construction], default, rtol=1e-12)
+
+def test_abr_run_batch():
+    import pytest
+    import numpy as np
+    from numpy.testing import assert_allclose
+    import qsdsan as qs
+
+    _create_abr_cmps()
+    ABR = qs.sanunits.AnaerobicBaffledReactor
+    # `N_removal` of the last set removes more N than the influent NH3
+    params = {'COD_removal': np.array([0.93, 0.5, 0.8]),
+              'N_removal': np.array([0.08, 0.3, 0.9]),
+              'MCF_decay': np.array([1., 0.8, 0.6]),
+              'max_CH4_emission': np.array([0.25, 0.2, 0.3]),
+              'N_max_decay': np.array([0.8, 0.7, 0.5]),
+              'N2O_EF_decay': np.array([0.0005, 0.001, 0.002])}
+    for if_capture_biogas in (True, False):
+        for if_N2O_emission in (True, False):
+            U1 = ABR(ins=qs.WasteStream(H2O=1000, NH3=5, NonNH3=2, OtherSS=10),
+                     if_capture_biogas=if_capture_biogas,
+                     if_N2O_emission=if_N2O_emission)
+            U1.ins[0]._COD = 500.
+            U1.max_CH4_emission = 0.25
+            batch = U1.run_batch(**params)
+
+            treated, biogas, CH4, N2O = U1.outs
+            for i in range(3):
+                for k, v in params.items(): setattr(U1, k, v[i])
+                U1._run()
+                CH4_prcd = biogas.imass['CH4'] if if_capture_biogas else CH4.imass['CH4']
+                assert_allclose(batch['CH4'][i], CH4_prcd, rtol=1e-12)
+                assert_allclose(batch['N2O'][i], N2O.imass['N2O'], rtol=1e-12)
+                assert_allclose(batch['NH3'][i], treated.imass['NH3'], rtol=1e-12, atol=1e-12)
+                assert_allclose(batch['NonNH3'][i], treated.imass['NonNH3'], rtol=1e-12)
+                assert_allclose(batch['COD'][i], treated._COD, rtol=1e-12)
+
+    # parameters not given use the current values of the unit
+    single = U1.run_batch(COD_removal=0.5)
+    assert_allclose(single['CH4'], 500.*U1.ins[0].F_vol/1e3*0.5*U1.MCF_decay*U1.max_CH4_emission)
+    with pytest.raises(ValueError):
+        U1.run_batch(tau=1)
+
+
 if __name__ == '__main__':
-    test_sanunit()
\ No newline at end of file
+    test_sanunit()
+    test_abr_design_batch()
+    test_abr_run_batch()
\ No newline at end of file
@@ -13,7 +13,7 @@ Please refer to https://github.com/QSD-Group/QSDsan/blob/master/LICENSE.txt
 for license details.
 '''
 
-__all__ = ('test_waste_stream',)
+__all__ = ('test_waste_stream', 'test_composite',)
 
 def test_waste_stream():
     import pytest, numpy as np
@@ -57,5 +57,73 @@ def test_waste_stream():
     assert_allclose(np.max(np.abs(diff)), 0, atol=1e-2)
 
 
+def test_composite():
+    import pytest
+    from numpy.testing import assert_allclose
+    from qsdsan import set_thermo, Components, WasteStream, _waste_stream as ws_module
+
+    cmps = Components.load_default()
+    # volumes of the components are not needed, so that
+    # the concentrations only depend on the given flows
+    for cmp in cmps:
+        cmp.copy_models_from(cmps.H2O, names=('V',))
+    set_thermo(cmps)
+    # components of all particle sizes, degradabilities, and organic/inorganic
+    flows = dict(S_F=75, S_Ac=20, S_CH4=0.5, S_U_Inf=25, C_B_Subst=40, C_U_Inf=5,
+                 X_B_Subst=150, X_OHO=30, X_U_Inf=25, X_Ig_ISS=20, S_NH4=25,
+                 S_NO3=5, S_N2=2, S_PO4=8, S_Ca=140, S_CO3=120, S_CAT=3, S_AN=3)
+    ws = WasteStream('ws', H2O=1e5, units='kg/hr', **flows)
+
+    sizes = {'g': 'Dissolved gas', 's': 'Soluble', 'c': 'Colloidal', 'x': 'Particulate'}
+    degradabilities = {'rb': ('Readily',), 'sb': ('Slowly',),
+                       'b': ('Readily', 'Slowly'), 'u': ('Undegradable',)}
+    # composite calculated component by component
+    def composite(variable, IDs, particle_size, degradability, organic):
+        total = 0.
+        for ID in IDs:
+            if ID == 'H2O': continue
+            cmp = getattr(cmps, ID)
+            if particle_size and cmp.particle_size != sizes[particle_size]: continue
+            if degradability and cmp.degradability not in degradabilities[degradability]: continue
+            if organic is not None and cmp.organic != organic: continue
+            not_gas = cmp.particle_size != 'Dissolved gas'
+            if variable == 'COD': factor = max(cmp.i_COD, 0) * not_gas
+            elif variable == 'N': factor = cmp.i_N * not_gas
+            elif variable == 'solids': factor = cmp.i_mass * not_gas
+            else: factor = cmp.i_charge
+            total += factor * ws.iconc[ID]
+        return total
+
+    # subgroups include components without flows
+    subgroups = (None, cmps.IDs[::2], ('S_F', 'X_OHO', 'S_NH4', 'S_N2', 'X_B_Subst', 'S_O2'))
+    for variable in ('COD', 'N', 'solids', 'charge'):
+        for subgroup in subgroups:
+            IDs = subgroup or cmps.IDs
+            for particle_size in (None, *sizes):
+                for degradability in (None, *degradabilities):
+                    for organic in (None, True, False):
+                        assert_allclose(
+                            ws.composite(variable, subgroup=subgroup,
+                                         particle_size=particle_size,
+                                         degradability=degradability,
+                                         organic=organic),
+                            composite(variable, IDs, particle_size, degradability, organic),
+                            rtol=1e-10, atol=1e-10)
+
+    c = ws.iconc
+    assert_allclose(ws.composite('COD', subgroup=('S_F', 'X_OHO', 'S_NH4')),
+                    cmps.S_F.i_COD*c['S_F']+cmps.X_OHO.i_COD*c['X_OHO'], rtol=1e-12)
+    assert_allclose(ws.composite('N', subgroup=('S_NH4', 'S_NO3', 'S_N2')),
+                    c['S_NH4']+c['S_NO3'], rtol=1e-12)
+
+    # only the data arrays of the components are available for a subgroup
+    view = ws_module._SubgroupView(cmps, ('S_F', 'X_OHO'))
+    assert_allclose(view.i_COD, cmps.i_COD[[cmps.index('S_F'), cmps.index('X_OHO')]])
+    for attr in ('IDs', 'index', 'subgroup', 'size'):
+        with pytest.raises(AttributeError):
+            getattr(view, attr)
+
+
 if __name__ == '__main__':
-    test_waste_stream()
\ No newline at end of file
+    test_waste_stream()
+    test_composite()
\ No newline at end of file